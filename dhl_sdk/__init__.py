@@ -1,5 +1,8 @@
 """DHL SDK for Python"""
 
+import importlib
+from typing import TYPE_CHECKING
+
 __all__ = [
     "APIKeyAuthentication",
     "DataHowLabClient",
@@ -17,19 +20,58 @@ __all__ = [
     "VariableSpectrumYAxis",
 ]
 
-from dhl_sdk.authentication import APIKeyAuthentication
-from dhl_sdk.client import DataHowLabClient
-from dhl_sdk.db_entities import (
-    Experiment,
-    Product,
-    Recipe,
-    Variable,
-    VariableCategorical,
-    VariableFlow,
-    FlowVariableReference,
-    VariableLogical,
-    VariableNumeric,
-    VariableSpectrum,
-    VariableSpectrumXAxis,
-    VariableSpectrumYAxis,
-)
+if TYPE_CHECKING:
+    # static analyzers and IDEs resolve the public names from these imports,
+    # at runtime they are loaded on demand by `__getattr__` below
+    from dhl_sdk.authentication import APIKeyAuthentication
+    from dhl_sdk.client import DataHowLabClient
+    from dhl_sdk.db_entities import (
+        Experiment,
+        FlowVariableReference,
+        Product,
+        Recipe,
+        Variable,
+        VariableCategorical,
+        VariableFlow,
+        VariableLogical,
+        VariableNumeric,
+        VariableSpectrum,
+        VariableSpectrumXAxis,
+        VariableSpectrumYAxis,
+    )
+
+# Public names are resolved from their submodules on first attribute access
+# (PEP 562), so `import dhl_sdk` does not load the client and entity modules
+# (and their pydantic/numpy/requests dependencies) until they are needed.
+_LAZY = {
+    "APIKeyAuthentication": ("dhl_sdk.authentication", "APIKeyAuthentication"),
+    "DataHowLabClient": ("dhl_sdk.client", "DataHowLabClient"),
+    "Experiment": ("dhl_sdk.db_entities", "Experiment"),
+    "Product": ("dhl_sdk.db_entities", "Product"),
+    "Recipe": ("dhl_sdk.db_entities", "Recipe"),
+    "Variable": ("dhl_sdk.db_entities", "Variable"),
+    "VariableCategorical": ("dhl_sdk.db_entities", "VariableCategorical"),
+    "VariableFlow": ("dhl_sdk.db_entities", "VariableFlow"),
+    "FlowVariableReference": ("dhl_sdk.db_entities", "FlowVariableReference"),
+    "VariableLogical": ("dhl_sdk.db_entities", "VariableLogical"),
+    "VariableNumeric": ("dhl_sdk.db_entities", "VariableNumeric"),
+    "VariableSpectrum": ("dhl_sdk.db_entities", "VariableSpectrum"),
+    "VariableSpectrumXAxis": ("dhl_sdk.db_entities", "VariableSpectrumXAxis"),
+    "VariableSpectrumYAxis": ("dhl_sdk.db_entities", "VariableSpectrumYAxis"),
+}
+
+
+def __getattr__(name: str):
+    try:
+        module_name, attribute = _LAZY[name]
+    except KeyError as err:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from err
+
+    value = getattr(importlib.import_module(module_name), attribute)
+    # cache in the module namespace so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
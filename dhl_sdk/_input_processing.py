@@ -6,6 +6,8 @@ import math
 # pylint: disable=too-few-public-methods
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from itertools import chain
+from types import MappingProxyType
 from typing import Optional, Protocol, Union
 
 import numpy as np
@@ -24,6 +26,20 @@ from dhl_sdk.exceptions import (
     InvalidTimestampsException,
 )
 
+_NUMERIC_VARIANTS = frozenset({"flow", "numeric"})
+_NUMERIC_GROUP_CODES = frozenset({"Flows", "FeedConc", "Inducers", "W", "X"})
+_TIMEDEPENDENT_GROUP_CODES = frozenset({"Flows", "W", "Inducers"})
+
+# seconds in each accepted unit of the timestamps
+_TIMESTAMPS_UNIT_SECONDS = MappingProxyType(
+    {
+        **dict.fromkeys(("s", "sec", "secs", "seconds"), 1),
+        **dict.fromkeys(("m", "min", "mins", "minutes"), 60),
+        **dict.fromkeys(("h", "hour", "hours"), 60 * 60),
+        **dict.fromkeys(("d", "day", "days"), 60 * 60 * 24),
+    }
+)
+
 
 class Group(Protocol):
     # pylint: disable=missing-class-docstring
@@ -108,7 +124,7 @@ class SpectraPreprocessor(Preprocessor):
         Parameters
         ----------
         spectra : Union[list[list[float]], np.ndarray]
-            The spectra to be validated
+            The spectra to be validated, converted to a 2D float array
         model : Model
             The model to use for prediction.
         inputs : dict, optional
@@ -136,22 +152,25 @@ class SpectraPreprocessor(Preprocessor):
         self.spectra = _validate_spectra_format(self.spectra)
 
         # Validate number of wavelengths in spectra
-        for i, spectrum in enumerate(self.spectra):
-            if len(spectrum) != self.model.spectra_size:
-                raise InvalidSpectraException(
-                    (
-                        f"Invalid Spectra: The Number of Wavelengths does not"
-                        f"match training data for spectrum number: {i+1}. "
-                        f"Expected: {self.model.spectra_size}, Got: {len(spectrum)}"
-                    )
+        n_wavelengths = self.spectra.shape[1]
+        if n_wavelengths != self.model.spectra_size:
+            raise InvalidSpectraException(
+                (
+                    f"Invalid Spectra: The Number of Wavelengths does not "
+                    f"match training data. "
+                    f"Expected: {self.model.spectra_size}, Got: {n_wavelengths}"
                 )
-            if validate_list_elements(spectrum):
-                raise InvalidSpectraException(
-                    (
-                        f"Invalid Spectra: The Spectra contains not "
-                        f"valid values for spectrum number: {i+1}"
-                    )
+            )
+
+        # Validate if spectra contain NaN or infinite values
+        invalid_rows = ~np.isfinite(self.spectra).all(axis=1)
+        if invalid_rows.any():
+            raise InvalidSpectraException(
+                (
+                    f"Invalid Spectra: The Spectra contains not "
+                    f"valid values for spectrum number: {int(invalid_rows.argmax()) + 1}"
                 )
+            )
 
         if self.inputs is None:
             if len(self.model.inputs) > 0:
@@ -171,7 +190,9 @@ class SpectraPreprocessor(Preprocessor):
                 raise InvalidInputsException(
                     f"The Number of values does not match the number of spectra for input: {key}"
                 )
-            if validate_list_elements(value):
+
+        for key, is_invalid in zip(self.inputs, _invalid_inputs(self.inputs)):
+            if is_invalid:
                 raise InvalidInputsException(
                     f"Invalid Inputs: The Inputs contain non-valid values for input: {key}"
                 )
@@ -202,19 +223,22 @@ class SpectraPreprocessor(Preprocessor):
             variable for variable in model_variables if variable.id in self.model.inputs
         ]
 
+        variable_index = _variable_index(input_variables)
+
         # validate inputs codes and format for ids
         formatted_inputs = {}
         for key, value in self.inputs.items():
-            for variable in input_variables:
-                if variable.matches_key(key):
-                    formatted_inputs[variable.id] = value
-                    break
+            variable = variable_index.get(key)
+            if variable is not None:
+                formatted_inputs[variable.id] = value
             else:
-                correct_inputs = [print(variable) for variable in input_variables]
+                correct_inputs = ", ".join(
+                    str(variable.code) for variable in input_variables
+                )
                 raise InvalidInputsException(
                     (
                         f"No matching Input found for key: {key}. "
-                        f"Please select one of the following as inputs: {*correct_inputs,}"
+                        f"Please select one of the following as inputs: {correct_inputs}"
                     )
                 )
 
@@ -295,15 +319,15 @@ class CultivationPropagationPreprocessor(Preprocessor):
         formatted_inputs = {}
 
         # order the dict according to Variables and insert timestamps
-        for key, value in self.inputs.copy().items():
-            for variable in model_variables:
-                if variable.matches_key(key):
-                    formatted_inputs[variable.id] = {}
-                    formatted_inputs[variable.id]["values"] = value
-                    formatted_inputs[variable.id]["timestamps"] = self.timestamps[
-                        : len(value)
-                    ]
-                    break
+        variable_index = _variable_index(model_variables)
+        for key, value in self.inputs.items():
+            variable = variable_index.get(key)
+            if variable is not None:
+                formatted_inputs[variable.id] = {}
+                formatted_inputs[variable.id]["values"] = value
+                formatted_inputs[variable.id]["timestamps"] = self.timestamps[
+                    : len(value)
+                ]
 
         for variable in input_variables:
             if variable.id in formatted_inputs:
@@ -394,16 +418,16 @@ class CultivationHistoricalPreprocessor(Preprocessor):
         formatted_inputs = {}
 
         # order the dict according to Variables and insert timestamps and steps
-        for key, value in self.inputs.copy().items():
-            for variable in model_variables:
-                if variable.matches_key(key):
-                    formatted_inputs[variable.id] = {}
-                    formatted_inputs[variable.id]["values"] = value
-                    formatted_inputs[variable.id]["timestamps"] = self.timestamps[
-                        : len(value)
-                    ]
-                    formatted_inputs[variable.id]["steps"] = self.steps[: len(value)]
-                    break
+        variable_index = _variable_index(model_variables)
+        for key, value in self.inputs.items():
+            variable = variable_index.get(key)
+            if variable is not None:
+                formatted_inputs[variable.id] = {}
+                formatted_inputs[variable.id]["values"] = value
+                formatted_inputs[variable.id]["timestamps"] = self.timestamps[
+                    : len(value)
+                ]
+                formatted_inputs[variable.id]["steps"] = self.steps[: len(value)]
 
         for variable in input_variables:
             if variable.id in formatted_inputs:
@@ -416,6 +440,36 @@ class CultivationHistoricalPreprocessor(Preprocessor):
         return [json_data]
 
 
+def _invalid_inputs(inputs: dict[str, list]) -> list[bool]:
+    """Check which inputs contain non-valid values, validating the values
+    of all inputs at once as a (inputs x spectra) matrix when possible.
+    """
+    try:
+        values = np.asarray(list(inputs.values()))
+    except ValueError:
+        values = None
+    if values is not None and values.ndim == 2 and values.dtype.kind in "biuf":
+        return (~np.isfinite(values).all(axis=1)).tolist()
+
+    # non numeric values, check each input to find the invalid one
+    return [validate_list_elements(value) for value in inputs.values()]
+
+
+def _variable_index(variables: list[Variable]) -> dict[str, Variable]:
+    """Map the ids and codes of the variables to the variables,
+    so that each input key is matched with a single lookup.
+
+    Equivalent to searching for the first variable for which
+    `variable.matches_key(key)` is True.
+    """
+    index = {}
+    for variable in variables:
+        index.setdefault(variable.id, variable)
+        if variable.code is not None:
+            index.setdefault(variable.code, variable)
+    return index
+
+
 def _validate_upstream_timestamps(
     timestamps: list[Union[int, float]], timestamps_unit: str
 ) -> list[Union[int, float]]:
@@ -456,16 +510,25 @@ def _validate_upstream_timestamps(
             "Timestamps must be a list of at least 2 values"
         )
 
-    # Validate if timestamps are valid numeric values
-    if not all(
-        isinstance(value, (int, float)) and math.isfinite(value) for value in timestamps
+    # Validate if timestamps are valid numeric values, checking all of them in
+    # one pass over an array (strings, None or nested lists give a non numeric
+    # or non 1D array)
+    try:
+        values = np.asarray(timestamps)
+    except ValueError:
+        values = None
+    if (
+        values is None
+        or values.ndim != 1
+        or values.dtype.kind not in "biuf"
+        or not np.isfinite(values).all()
     ):
         raise InvalidTimestampsException(
             "All values of timestamps must be valid numeric values"
         )
 
     # Validate if timestamps are in ascending order and unique
-    if any(a >= b for a, b in zip(timestamps, timestamps[1:])):
+    if (np.diff(values) <= 0).any():
         raise InvalidTimestampsException("Timestamps must be in ascending order")
 
     # Validate if timestamps are positive (Since they are ordered, just check the first one)
@@ -473,21 +536,15 @@ def _validate_upstream_timestamps(
         raise InvalidTimestampsException("Timestamps must be positive")
 
     # Convert timestamps to seconds
-    if timestamps_unit.lower() in ("s", "sec", "secs", "seconds"):
+    factor = _TIMESTAMPS_UNIT_SECONDS.get(timestamps_unit.lower())
+    if factor is None:
+        raise InvalidTimestampsException(
+            f"Invalid timestamps unit '{timestamps_unit}' found."
+        )
+    if factor == 1:
         return timestamps
-    if timestamps_unit.lower() in ("m", "min", "mins", "minutes"):
-        factor = 60
-        return [timestamp * factor for timestamp in timestamps]
-    if timestamps_unit.lower() in ("h", "hour", "hours"):
-        factor = 60 * 60
-        return [timestamp * factor for timestamp in timestamps]
-    if timestamps_unit.lower() in ("d", "day", "days"):
-        factor = 60 * 60 * 24
-        return [timestamp * factor for timestamp in timestamps]
 
-    raise InvalidTimestampsException(
-        f"Invalid timestamps unit '{timestamps_unit}' found."
-    )
+    return (values * factor).tolist()
 
 
 def _validate_historical_steps(
@@ -523,7 +580,11 @@ def _validate_historical_steps(
     # Validate if steps are in ascending order and unique
     filtered_steps = [step for step in steps if step is not None]
 
-    if any(a >= b for a, b in zip(filtered_steps, filtered_steps[1:])):
+    steps_values = np.asarray(filtered_steps)
+    if steps_values.size > 0 and steps_values.dtype.kind not in "iuf":
+        raise InvalidStepsException("Steps must be a list of numbers")
+
+    if (np.diff(steps_values) <= 0).any():
         raise InvalidStepsException("Steps must be in ascending order")
 
     # Validate if steps start at 0
@@ -696,45 +757,42 @@ def format_predictions(predictions: list[PredictResponse], model: Model) -> Pred
 
     variables = [var.code for var in model.dataset.variables]
 
-    dic = {}
+    # collect the batches of each variable and join them once at the end
+    batches = {
+        code: {"values": [], "upperBound": [], "lowerBound": []} for code in variables
+    }
 
     for pred in predictions:
-        for i, instance in enumerate(pred.instances[0]):
+        for code, instance in zip(variables, pred.instances[0]):
             if instance is not None:
-                if variables[i] not in dic:
-                    dic[variables[i]] = {}
-
-                    dic[variables[i]]["values"] = instance.values.copy()
-
-                    if instance.high_values is not None:
-                        dic[variables[i]]["upperBound"] = instance.high_values.copy()
-                    if instance.low_values is not None:
-                        dic[variables[i]]["lowerBound"] = instance.low_values.copy()
-                else:
-                    dic[variables[i]]["values"].extend(instance.values)
-
-                    if instance.high_values is not None:
-                        dic[variables[i]]["upperBound"].extend(instance.high_values)
-                    if instance.low_values is not None:
-                        dic[variables[i]]["lowerBound"].extend(instance.low_values)
-
-    return dic
+                variable_batches = batches[code]
+                variable_batches["values"].append(instance.values)
+
+                if instance.high_values is not None:
+                    variable_batches["upperBound"].append(instance.high_values)
+                if instance.low_values is not None:
+                    variable_batches["lowerBound"].append(instance.low_values)
+
+    # only keep the variables and bounds that were returned in the predictions
+    return {
+        code: {
+            key: list(chain.from_iterable(lists))
+            for key, lists in variable_batches.items()
+            if lists
+        }
+        for code, variable_batches in batches.items()
+        if variable_batches["values"]
+    }
 
 
 def variant_is_numeric(variant: str) -> bool:
     """Check if the variant is numeric"""
-    return variant in ["flow", "numeric"]
+    return variant in _NUMERIC_VARIANTS
 
 
 def groupcode_is_numeric(code: str):
     """Check if the group is numeric"""
-    return code in [
-        "Flows",
-        "FeedConc",
-        "Inducers",
-        "W",
-        "X",
-    ]
+    return code in _NUMERIC_GROUP_CODES
 
 
 def groupcode_is_output(code: str):
@@ -744,4 +802,4 @@ def groupcode_is_output(code: str):
 
 def groupcode_is_timedependent(code: str):
     """Check if the group is time dependent for recipe only"""
-    return code in ["Flows", "W", "Inducers"]
+    return code in _TIMEDEPENDENT_GROUP_CODES
@@ -6,7 +6,6 @@ from typing import Optional, Protocol, Union
 
 import numpy as np
 
-from dhl_sdk._utils import Instance, PredictRequest
 from dhl_sdk.exceptions import InvalidSpectraException
 
 # Type Aliases
@@ -43,7 +42,11 @@ class SpectraModel(Protocol):
         ...
 
 
-def _validate_spectra_format(spectra: SpectraData) -> list[list[float]]:
+# approximate size of a float encoded in JSON, e.g. "0.12345678901234567, "
+_JSON_FLOAT_BYTES = 20
+
+
+def _validate_spectra_format(spectra: SpectraData) -> np.ndarray:
     """
     Validates and formats the spectra.
 
@@ -54,26 +57,93 @@ def _validate_spectra_format(spectra: SpectraData) -> list[list[float]]:
 
     Returns
     -------
-    list
-        The spectra as a list.
+    numpy.ndarray
+        The spectra as a 2D float array.
 
     Raises
     ------
     InvalidSpectraException
-        If the spectra is not a list or numpy array.
+        If the spectra is not a list or numpy array, if the spectra do not all
+        have the same number of wavelengths or if they contain non numeric values.
     """
 
-    if isinstance(spectra, np.ndarray):
-        spectra = spectra.tolist()
-
-    elif isinstance(spectra, list):
-        pass
-    else:
+    if not isinstance(spectra, (list, np.ndarray)):
         raise InvalidSpectraException(
             f"Spectra must be a list or numpy array, but got {type(spectra)}"
         )
 
-    return spectra
+    try:
+        array = np.asarray(spectra)
+    except ValueError as err:
+        # nested lists of different lengths can not form a 2D array
+        raise InvalidSpectraException(
+            "Invalid Spectra: All spectra must have the same number of wavelengths"
+        ) from err
+
+    # strings, None and other objects are not valid spectra values
+    if array.dtype.kind not in "biuf":
+        raise InvalidSpectraException(
+            "Invalid Spectra: The Spectra contains non numeric values"
+        )
+
+    if array.ndim != 2:
+        raise InvalidSpectraException(
+            "Invalid Spectra: The Spectra must be a list of spectra (2D array)"
+        )
+
+    return np.asarray(array, dtype=np.float64)
+
+
+def _batch_to_list(batch: Union[list, np.ndarray]) -> list:
+    """Materialize a batch as a list, converting array slices in a single call"""
+    if isinstance(batch, np.ndarray):
+        return batch.tolist()
+    return batch
+
+
+def _build_instance(values: list, sample_ids: list[str]) -> dict:
+    """Build the JSON of an Instance directly, in the same form as
+    `Instance(...).model_dump(by_alias=True)`, as the values were already
+    validated by the preprocessor. The tests check the requests built from
+    it against `PredictRequest`."""
+    return {
+        "timestamps": None,
+        "sampleId": sample_ids,
+        "values": values,
+        "highValues": None,
+        "lowValues": None,
+    }
+
+
+def _limit_batch_size(
+    spectra: SpectraData, batch_size: int, target_bytes: Optional[int]
+) -> int:
+    """Limit the batch size so that the JSON of each batch of spectra
+    stays around target_bytes, if given"""
+    n_wavelengths = len(spectra[0]) if len(spectra) > 0 else 0
+    if target_bytes is None or n_wavelengths == 0:
+        return batch_size
+
+    row_bytes = _JSON_FLOAT_BYTES * n_wavelengths
+    return max(1, min(batch_size, target_bytes // row_bytes))
+
+
+def _input_columns(variables: list, inputs: Optional[dict]) -> list[tuple]:
+    """Get the position of each input in the instance, with its values"""
+    if inputs is None:
+        return []
+
+    variable_index = {}
+    for index, variable in enumerate(variables):
+        variable_index.setdefault(variable.id, index)
+
+    # inputs were validated as numeric, convert them once to floats as
+    # the instances are built without pydantic's coercion
+    return [
+        (variable_index[input_id], np.asarray(input_values, dtype=np.float64))
+        for input_id, input_values in inputs.items()
+        if input_id in variable_index
+    ]
 
 
 def _convert_to_request(
@@ -81,6 +151,7 @@ def _convert_to_request(
     model: SpectraModel,
     inputs: Optional[dict] = None,
     batch_size: int = 50,
+    target_bytes: Optional[int] = None,
 ) -> list[dict]:
     """
     Convert spectra and inputs to a list of JSON requests.
@@ -88,14 +159,20 @@ def _convert_to_request(
 
     Parameters
     ----------
-    spectra : list[list[float]]
-        A list of spectra, where each spectrum is a list of floats.
+    spectra : list[list[float]] or numpy.ndarray
+        The spectra, as a list of lists of floats or a 2D array.
+        Arrays are only converted to lists one batch at a time.
     model : Model
         The model to use for prediction.
     inputs : dict, optional
         A dictionary of input variables and their values, by default None.
     batch_size : int, optional
         The maximum number of spectra to include in each request, by default 50.
+    target_bytes : int, optional
+        The approximate maximum size of the spectra in each request once encoded
+        as JSON, by default None, i.e. only batch_size limits the batches. When
+        given, wide spectra are sent in smaller batches so that requests stay
+        under this size.
 
     Returns
     -------
@@ -103,27 +180,33 @@ def _convert_to_request(
         A list of JSON requests, where each request contains a list of instances.
     """
 
+    batch_size = _limit_batch_size(spectra, batch_size, target_bytes)
+
     # get number of vars in model from config
-    variables = model.dataset.variables
-    n_vars = len(variables)
+    n_vars = len(model.dataset.variables)
     spectrum_index = model.dataset.get_spectrum_index()
 
+    # resolve the position of each input in the instance once for all batches
+    input_columns = _input_columns(model.dataset.variables, inputs)
+
+    # the sample ids only depend on the batch size, build them once
+    batch_sample_ids = [str(i) for i in range(min(batch_size, len(spectra)))]
+
     request_data = []
     # handle pagination
     for i in range(0, len(spectra), batch_size):
+        sample_ids = batch_sample_ids[: len(spectra) - i]
+
         instance = [None] * n_vars
-        instance[spectrum_index] = Instance(values=spectra[i : i + batch_size])
-
-        if inputs is not None:
-            for input_id, input_values in inputs.items():
-                for index, variable in enumerate(variables):
-                    if variable.id == input_id:
-                        instance[index] = Instance(
-                            values=input_values[i : i + batch_size]
-                        )
-                        break
-
-        json_data = PredictRequest(instances=[instance]).model_dump(by_alias=True)
-        request_data.append(json_data)
+        instance[spectrum_index] = _build_instance(
+            _batch_to_list(spectra[i : i + batch_size]), sample_ids
+        )
+
+        for index, input_values in input_columns:
+            instance[index] = _build_instance(
+                _batch_to_list(input_values[i : i + batch_size]), sample_ids
+            )
+
+        request_data.append({"instances": [instance], "metadata": None, "config": None})
 
     return request_data
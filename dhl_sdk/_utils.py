@@ -1,15 +1,19 @@
 """This module contains generic utility functions used in the SDK
 """
 
+import hashlib
+import re
+import threading
+import time
 import urllib.parse as urlparse
 from datetime import datetime
-from functools import reduce
+from functools import lru_cache, reduce
 from typing import Optional, Union
 
 import numpy as np
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_serializer
 
-from dhl_sdk.crud import Client
+from dhl_sdk.crud import Client, decode_json
 
 Predictions = dict[str, dict[str, list[float]]]
 
@@ -26,29 +30,67 @@ TEMPLATES_URL = "api/db/v2/pipelineJobTemplates"
 PREDICT_URL = "api/pipeline/v1/predictors"
 
 
+# seconds for which the variable group codes of an application are reused
+GROUPS_CACHE_TTL = 300
+
+
 class VariableGroupCodes:
-    """Singleton class to store the variable group codes"""
+    """Variable group codes of the application of a client, shared by the
+    clients of the same application and user for `GROUPS_CACHE_TTL` seconds"""
+
+    __slots__ = ("variable_group_codes", "_expires_at")
 
-    _instance = None
-    variable_group_codes = {}
+    _instances: dict = {}
+    _lock = threading.Lock()
+    variable_group_codes: dict[str, tuple[str, str]]
+    _expires_at: float
 
     def __new__(cls, client):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialize(client)
-        return cls._instance
+        key = cls._client_key(client)
+
+        # fetch under the lock, so that concurrent callers request the groups once
+        with cls._lock:
+            now = time.monotonic()
+            instance = cls._instances.get(key)
+            if instance is None or instance._expires_at <= now:
+                instance = super().__new__(cls)
+                instance._initialize(client)
+                # drop the expired groups of other clients, not to keep them forever
+                for expired in [
+                    other
+                    for other, codes in cls._instances.items()
+                    if codes._expires_at <= now
+                ]:
+                    del cls._instances[expired]
+                cls._instances[key] = instance
+        return instance
+
+    @staticmethod
+    def _client_key(client) -> object:
+        """Key of the application and user of a client: its URL, a digest of its
+        API key and its TLS verification. Other clients are keyed by themselves."""
+        api_key = getattr(getattr(client, "auth_key", None), "api_key", None)
+        if not isinstance(api_key, str):
+            return client
+
+        key_digest = hashlib.blake2b(api_key.encode(), digest_size=8).digest()
+        return (client.base_url, key_digest, client.session.verify)
 
     def _initialize(self, client: Client):
-        group_codes = {}
-        groups = client.get(GROUPS_URL).json()
-
-        for group in groups:
-            group_codes[group["name"]] = (group["id"], group["code"])
-
-        self.variable_group_codes = group_codes
+        self.variable_group_codes = {
+            group["name"]: (group["id"], group["code"])
+            for group in decode_json(client.get(GROUPS_URL))
+        }
+        self._expires_at = time.monotonic() + GROUPS_CACHE_TTL
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget the cached variable group codes of all clients"""
+        with cls._lock:
+            cls._instances.clear()
 
     def get_variable_group_codes(self) -> dict[str, tuple[str, str]]:
-        """Returns the variable group codes saved in singleton"""
+        """Returns the cached variable group codes"""
         return self.variable_group_codes
 
 
@@ -66,12 +108,16 @@ class Instance(BaseModel):
         default=None, alias="lowValues"
     )
 
-    @model_validator(mode="after")
-    def generate_sample_ids(self):
-        """Generates sample ids if not provided"""
-        if self.sample_id is None:
-            self.sample_id = [str(i) for i in range(len(self.values))]
-        return self
+    @field_serializer("sample_id")
+    def generate_sample_ids(self, sample_id: Optional[list[str]]) -> list[str]:
+        """Generates sample ids if not provided.
+
+        This is done when serializing, so that instances parsed from
+        prediction responses, whose sample ids are never used, skip it.
+        """
+        if sample_id is None:
+            return [str(i) for i in range(len(self.values))]
+        return sample_id
 
 
 class PredictRequest(BaseModel):
@@ -88,24 +134,51 @@ class PredictResponse(BaseModel):
     instances: list[list[Optional[Instance]]]
 
 
+# url pieces for which `urllib.parse.urljoin` is a plain string concatenation:
+# a base url without query, fragment or empty path segments, and relative paths
+# made of non-empty segments, without "." or ".." segments
+_PATH_SEGMENT = r"[A-Za-z0-9._~%!$&'()*+,=@-]+"
+_SIMPLE_BASE_URL_RE = re.compile(
+    rf"\A[a-z][a-z0-9+.-]*://[A-Za-z0-9.:@\[\]-]+/(?:{_PATH_SEGMENT}/)*\Z"
+)
+_RELATIVE_PATH_RE = re.compile(rf"\A(?:{_PATH_SEGMENT}/)*(?:{_PATH_SEGMENT})?\Z")
+_DOT_SEGMENT_RE = re.compile(r"(?:\A|/)\.\.?(?:/|\Z)")
+
+
+# the same few endpoint paths are joined onto the base url for every request
+@lru_cache(maxsize=256)
 def urljoin(*args) -> str:
     """join url elements together into one url"""
     elements = [
         f"{arg}/" if arg[-1] != "/" and i != len(args) - 1 else arg
         for i, arg in enumerate(args)
     ]
+
+    # joining plain relative paths onto a simple base url just appends them,
+    # so skip parsing the url again for each element
+    if (
+        _SIMPLE_BASE_URL_RE.match(elements[0])
+        and all(_RELATIVE_PATH_RE.match(element) for element in elements[1:])
+        and not any(_DOT_SEGMENT_RE.search(element) for element in elements)
+    ):
+        return "".join(elements)
+
     return reduce(urlparse.urljoin, elements)
 
 
 def validate_list_elements(arr: list) -> bool:
     """Validates if an array contains non float values"""
-    return any(
-        not isinstance(item, (float, int))
-        or item is None
-        or np.isnan(item)
-        or np.isinf(item)
-        for item in arr
-    )
+    try:
+        values = np.asarray(arr)
+    except ValueError:
+        # nested sequences of different lengths
+        return True
+
+    # strings, None or nested sequences do not give a flat numeric array
+    if values.ndim != 1 or values.dtype.kind not in "biuf":
+        return True
+
+    return not np.isfinite(values).all()
 
 
 def get_id_list(json_list: list[dict]) -> list[str]:
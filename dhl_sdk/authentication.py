@@ -26,8 +26,11 @@ Usage:
 import os
 from typing import Optional
 
+from requests import PreparedRequest
+from requests.auth import AuthBase
 
-class APIKeyAuthentication:
+
+class APIKeyAuthentication(AuthBase):
     # pylint: disable=too-few-public-methods
     """
     API Key Authentication
@@ -50,16 +53,34 @@ class APIKeyAuthentication:
         """
         self.api_key = self._get_api_key(api_key)
 
+    @property
+    def api_key(self) -> str:
+        """API Key used to authenticate with the DHL API"""
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, api_key: str) -> None:
+        self._api_key = api_key
+        # the headers only depend on the API Key, build them once per key
+        self._headers = {"Authorization": f"ApiKey {api_key}"}
+
     def get_headers(self) -> dict[str, str]:
         """Get the authorization headers to add to the
         requests using the API Key.
 
+        The same dictionary is returned on every call, it must not be modified.
+
         Returns
         -------
         dict
             Authorization Headers for the request to the API
         """
-        return {"Authorization": f"ApiKey {self.api_key}"}
+        return self._headers
+
+    def __call__(self, request: PreparedRequest) -> PreparedRequest:
+        """Add the authorization headers to a request, as a `requests` auth"""
+        request.headers.update(self.get_headers())
+        return request
 
     def _get_api_key(self, api_key: Optional[str] = None) -> str:
         """Get the API Key from the environment variables
@@ -76,10 +97,11 @@ class APIKeyAuthentication:
             API Key
         """
 
-        if api_key is None:
-            api_key = os.environ.get("DHL_API_KEY", None)
+        if api_key is not None:
+            return api_key
 
-        if api_key is None:
+        # read when needed, the variable may be set after the module is imported
+        if (api_key := os.environ.get("DHL_API_KEY")) is None:
             raise KeyError("DHL API Key not found")
 
         return api_key
@@ -10,37 +10,272 @@ Classes:
     - DataHowLabClient: main client to interact with the DHL API
 """
 
+import json
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any, Dict, Literal, Optional, Type, TypeVar, Union
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlsplit
 
 import requests
+from pydantic_core import PydanticSerializationError, to_json
 from requests import Response
 from requests.adapters import HTTPAdapter
+from requests.exceptions import InvalidJSONError, RetryError
 import urllib3
 from urllib3.util.retry import Retry
 
 from dhl_sdk._utils import VariableGroupCodes, urljoin
 from dhl_sdk.authentication import APIKeyAuthentication
-from dhl_sdk.crud import Result
+from dhl_sdk.crud import EntityCache, Result
 from dhl_sdk.db_entities import DataBaseEntity, Experiment, Product, Recipe
 from dhl_sdk.entities import CultivationProject, Project, SpectraProject, Variable
+from dhl_sdk.exceptions import ServiceUnavailableException
 
-PROJECT_TYPE_MAP = {
-    "cultivation": ("04a324da-13a5-470b-94a1-bda6ac87bb86", CultivationProject),
-    "spectroscopy": ("373c173a-1f23-4e56-874e-90ca4702ec0d", SpectraProject),
-}
+PROJECT_TYPE_MAP = MappingProxyType(
+    {
+        "cultivation": ("04a324da-13a5-470b-94a1-bda6ac87bb86", CultivationProject),
+        "spectroscopy": ("373c173a-1f23-4e56-874e-90ca4702ec0d", SpectraProject),
+    }
+)
 
 
 T = TypeVar("T", bound=Project)
 
+# variants accepted by the variable type filter of `get_variables`
+VARIABLE_TYPES = frozenset(("categorical", "flow", "logical", "numeric"))
+
+# number of entities requested per page when iterating over a Result
+DEFAULT_PAGE_SIZE = 100
+
+
+def _validate_page_size(page_size: int) -> None:
+    if not (isinstance(page_size, int) and page_size > 0):
+        raise ValueError("page_size must be a positive integer")
+
+
+_JSON_HEADERS = MappingProxyType({"Content-Type": "application/json"})
+
+
+def _encode_json(data: Any) -> bytes:
+    """Encode the data of a request as JSON.
+
+    pydantic's serializer is much faster than the json module used by
+    `requests`, but it writes NaN and infinite floats as invalid JSON, so
+    those are still rejected like `requests` does. Values that can not be
+    encoded, like numpy integers, raise a TypeError as with the json module.
+    """
+    try:
+        payload = to_json(data)
+    except PydanticSerializationError as err:
+        raise TypeError(str(err)) from err
+    # the json module only tells apart such floats from strings containing them
+    if b"NaN" in payload or b"Infinity" in payload:
+        try:
+            json.dumps(data, allow_nan=False)
+        except ValueError as err:
+            raise InvalidJSONError(err) from err
+    return payload
+
+
+# strings made only of these characters are left unchanged by quote_plus
+_URL_SAFE_RE = re.compile(r"\A[A-Za-z0-9_.~\[\]-]*\Z")
+
+
+def _quote(value: Any) -> str:
+    """Quote a query string element, skipping `quote_plus` if already URL safe"""
+    if not isinstance(value, str):
+        value = str(value)
+    if _URL_SAFE_RE.match(value):
+        return value
+    return quote_plus(value, safe="[]")
+
+
+@lru_cache(maxsize=4096)
+def _encode_pair(key: str, value: str) -> str:
+    """Encode a single `key=value` pair, cached since paginated requests
+    repeat the same filters and only change the offset"""
+    return f"{_quote(key)}={_quote(value)}"
+
+
+def _encode_query(query_params: Dict[str, Any]) -> str:
+    """Encode the query parameters into a query string.
+
+    Equivalent to `urlencode(query_params, doseq=True, safe="[]")`, but builds
+    the `key=value` strings directly and joins them in a single pass.
+    """
+    parts = []
+    for key, value in query_params.items():
+        # plain string values are by far the most common, test them first
+        if isinstance(value, str):
+            parts.append(_encode_pair(key, value))
+        elif not isinstance(value, (list, tuple)):
+            parts.append(f"{_quote(key)}={_quote(value)}")
+        else:
+            key = _quote(key)
+            parts.extend(f"{key}={_quote(item)}" for item in value)
+
+    return "&".join(parts)
+
+
+# responses and idempotent methods for which requests are retried
+RETRY_STATUS_CODES = frozenset((429, 502, 503, 504))
+RETRY_METHODS = frozenset(("DELETE", "GET", "HEAD", "OPTIONS", "PUT", "TRACE"))
+
+# connections kept open to the API, enough for the prediction batches and result
+# pages that are requested concurrently from the background threads
+CONNECTION_POOL_SIZE = 32
+
+
+class _JitteredRetry(Retry):
+    """Retry with "full jitter" backoff, sleeping a random time up to the
+    exponential backoff, so that clients failing together do not retry in
+    lockstep. A `Retry-After` header sent by the server is still honored."""
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+# consecutive failed requests to a host after which requests to it are rejected,
+# and seconds after which a single request is let through again
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RECOVERY_TIMEOUT = 30
+# responses telling that the host is unavailable, other errors like a 500 for
+# an invalid request body do not pause the requests of the other clients
+CIRCUIT_FAILURE_STATUS_CODES = frozenset(
+    code for code in RETRY_STATUS_CODES if code >= 500
+)
+
+
+class _CircuitBreaker:
+    """Tracks the failures of a host, so that requests fail fast while it is
+    down instead of going through the whole retry backoff each time"""
+
+    __slots__ = ("_failures", "_opened_at", "_trial", "_lock")
+
+    def __init__(self) -> None:
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request can be sent to the host"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < CIRCUIT_RECOVERY_TIMEOUT:
+                return False
+            # after the timeout, a single trial request tells if the host is back
+            if self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        # pylint: disable=missing-function-docstring
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        # pylint: disable=missing-function-docstring
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+            if self._failures >= CIRCUIT_FAILURE_THRESHOLD:
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Allow a new trial request after one ended without a response"""
+        with self._lock:
+            self._trial = False
+
+
+_BREAKERS: Dict[str, _CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def _get_breaker(host: str) -> _CircuitBreaker:
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(host)
+        if breaker is None:
+            breaker = _BREAKERS[host] = _CircuitBreaker()
+    return breaker
+
+
+def _reset_breakers() -> None:
+    """Forget the failures of all hosts"""
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+class _APIAdapter(HTTPAdapter):
+    """HTTPAdapter that bounds the number of requests in flight and rejects
+    the requests to hosts that keep failing. The failures are counted once
+    the retries of a request are exhausted.
+
+    Adapters are shared by all the clients of an application URL, so the
+    limit of requests in flight applies to all of them, whatever their API
+    key. The failures are tracked per host for the whole process."""
+
+    def __init__(self, *args, max_concurrency: int = CONNECTION_POOL_SIZE, **kwargs):
+        super().__init__(*args, **kwargs)
+        # callers beyond the limit wait here instead of queuing on the pool
+        self._bulkhead = threading.BoundedSemaphore(max_concurrency)
+
+    def send(self, request, *args, **kwargs):  # pylint: disable=arguments-differ
+        host = urlsplit(request.url).netloc
+        breaker = _get_breaker(host)
+        if not breaker.allow():
+            raise ServiceUnavailableException(
+                f"Requests to '{host}' are paused after repeated failures, "
+                f"try again in {CIRCUIT_RECOVERY_TIMEOUT} seconds"
+            )
+
+        try:
+            with self._bulkhead:
+                response = super().send(request, *args, **kwargs)
+        except (requests.ConnectionError, requests.Timeout, RetryError):
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # e.g. an interrupted request, it must not keep the host paused
+            breaker.release_trial()
+            raise
+
+        if response.status_code in CIRCUIT_FAILURE_STATUS_CODES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        return response
+
+
+# adapters shared by the clients of the same application URL and limit of requests
+# in flight, with any API key, so that new clients reuse the open connections
+# instead of doing a new TLS handshake. The clients share the limit of the adapter.
+_ADAPTERS: Dict[tuple, _APIAdapter] = {}
+_ADAPTERS_LOCK = threading.Lock()
+
 
 class Client:
     """
     A client for interacting with the DataHowLab API.
     """
 
+    __slots__ = ("auth_key", "base_url", "session", "entity_cache")
+
     def __init__(
-        self, auth_key: APIKeyAuthentication, base_url: str, verify: bool = True
+        self,
+        auth_key: APIKeyAuthentication,
+        base_url: str,
+        verify: bool = True,
+        max_concurrency: int = CONNECTION_POOL_SIZE,
     ) -> None:
         """
         Parameters
@@ -49,34 +284,71 @@ class Client:
             An instance of the APIKeyAuthentication class containing the user's API key.
         base_url : str
             The URL address of the datahowlab application
+        max_concurrency : int, optional
+            The maximum number of requests in flight to the application, shared by
+            the clients of the same URL and limit, by default 32.
 
         Returns
         -------
         NoneType
             None
+
+        Raises
+        ------
+        ValueError
+            If the base_url is not an absolute URL or max_concurrency is not
+            a positive integer.
         """
+        if not (isinstance(max_concurrency, int) and max_concurrency > 0):
+            raise ValueError("max_concurrency must be a positive integer")
+
+        parts = urlsplit(base_url)
+        if not (parts.scheme and parts.netloc):
+            raise ValueError(
+                f"base_url must be an absolute URL, like 'https://example.com', "
+                f"but got '{base_url}'"
+            )
+
         self.auth_key = auth_key
-        self.base_url = base_url
-        self.session = Client._get_retry_requester(
-            total_retries=5, backoff_factor=1, verify=verify
+        # normalized once with the trailing slash that `urljoin` expects of the base
+        self.base_url = f"{parts.scheme}://{parts.netloc}{parts.path.rstrip('/')}/"
+        self.session = Client._get_session(
+            auth_key, self.base_url, verify, max_concurrency
         )
+        # products and variables requested by id in the last minute
+        self.entity_cache = EntityCache()
 
     @staticmethod
-    def _get_retry_requester(
-        total_retries: int = 5, backoff_factor: int = 1, verify: int = True
-    ):
-        """Get the http session with retry strategy"""
-        status_forcelist = [429, 502, 503, 504]
-        allowed_methods = ["DELETE", "GET", "HEAD", "OPTIONS", "PUT", "TRACE"]
-
-        retry_strategy = Retry(
+    def _get_retry_adapter(
+        total_retries: int = 5,
+        backoff_factor: int = 1,
+        max_concurrency: int = CONNECTION_POOL_SIZE,
+    ) -> _APIAdapter:
+        """Get the http adapter with retry strategy"""
+        retry_strategy = _JitteredRetry(
             total=total_retries,
             backoff_factor=backoff_factor,
-            status_forcelist=status_forcelist,
-            allowed_methods=allowed_methods,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=RETRY_METHODS,
+        )
+
+        return _APIAdapter(
+            max_retries=retry_strategy,
+            pool_maxsize=max_concurrency,
+            max_concurrency=max_concurrency,
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+    @staticmethod
+    def _get_retry_requester(
+        total_retries: int = 5,
+        backoff_factor: int = 1,
+        verify: int = True,
+        adapter: Optional[_APIAdapter] = None,
+    ):
+        """Get the http session with retry strategy"""
+        if adapter is None:
+            adapter = Client._get_retry_adapter(total_retries, backoff_factor)
+
         http = requests.Session()
         http.verify = verify
         http.mount("https://", adapter)
@@ -84,6 +356,30 @@ class Client:
 
         return http
 
+    @staticmethod
+    def _get_session(
+        auth_key: APIKeyAuthentication,
+        base_url: str,
+        verify: Union[bool, str],
+        max_concurrency: int,
+    ) -> requests.Session:
+        """Get a session for the given API key and TLS verification, sending
+        its requests through the adapter shared by the clients of the URL
+        with the same limit of requests in flight"""
+        adapter_key = (base_url, max_concurrency)
+        with _ADAPTERS_LOCK:
+            adapter = _ADAPTERS.get(adapter_key)
+            if adapter is None:
+                adapter = _ADAPTERS[adapter_key] = Client._get_retry_adapter(
+                    total_retries=5, backoff_factor=1, max_concurrency=max_concurrency
+                )
+
+        session = Client._get_retry_requester(verify=verify, adapter=adapter)
+        # the authorization headers are read from the API key on every request
+        session.auth = auth_key
+
+        return session
+
     def post(self, path: str, json_data: Any) -> Response:
         """
         Sends a POST request to the specified
@@ -105,11 +401,15 @@ class Client:
         ------
         requests.exceptions.HTTPError
             If the server returns a non-2xx status code.
+        requests.exceptions.InvalidJSONError
+            If the JSON data contains NaN or infinite floats.
         """
         path = urljoin(self.base_url, path)
-        auth_headers = self.auth_key.get_headers()
 
-        response = self.session.post(path, headers=auth_headers, json=json_data)
+        # the large lists of floats of prediction requests are encoded in C
+        response = self.session.post(
+            path, headers=_JSON_HEADERS, data=_encode_json(json_data)
+        )
         response.raise_for_status()
 
         return response
@@ -136,14 +436,15 @@ class Client:
         requests.exceptions.HTTPError
             If the server returns a non-2xx status code.
         """
+        # join the path alone, so that the url of an endpoint is cached by
+        # `urljoin` for all its pages and the query is appended to it
+        path = urljoin(self.base_url, path)
+
         if query_params:
-            query_string = urlencode(query_params, doseq=True, safe="[]")
+            query_string = _encode_query(query_params)
             path = f"{path}?{query_string}"
 
-        path = urljoin(self.base_url, path)
-        auth_headers = self.auth_key.get_headers()
-
-        response = self.session.get(path, headers=auth_headers)
+        response = self.session.get(path)
         response.raise_for_status()
 
         return response
@@ -176,16 +477,19 @@ class Client:
         ------
         requests.exceptions.HTTPError
             If the server returns a non-2xx status code.
+        requests.exceptions.InvalidJSONError
+            If the JSON data contains NaN or infinite floats.
         """
         path = urljoin(self.base_url, path)
-        req_headers = self.auth_key.get_headers()
 
         if content_type == "application/json":
-            response = self.session.put(path, headers=req_headers, json=data)
+            response = self.session.put(
+                path, headers=_JSON_HEADERS, data=_encode_json(data)
+            )
             response.raise_for_status()
 
         elif content_type == "text/csv":
-            req_headers["Content-type"] = content_type
+            req_headers = {"Content-type": content_type}
             response = self.session.put(path, headers=req_headers, data=data)
             response.raise_for_status()
         else:
@@ -201,6 +505,7 @@ class Client:
         name: Optional[str] = None,
         unit_id: Optional[str] = None,
         offset: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE,
     ) -> Result[T]:
         """Retrieve the available projects for the user
 
@@ -212,6 +517,8 @@ class Client:
             Filter projects by process unit ID, by default None
         offset : int, optional
             The offset for pagination, must be a non-negative integer, by default 0
+        page_size : int, optional
+            The number of projects fetched per request, by default 100
         project_type : T, optional
             The type of project to retrieve, by default Project
 
@@ -224,20 +531,19 @@ class Client:
         if not (isinstance(offset, int) and offset >= 0):
             raise ValueError("offset must be a non-negative integer")
 
-        filter_params = {
-            key: value
-            for key, value in {
-                "filterBy[processUnitId]": unit_id,
-                "filterBy[name]": name,
-            }.items()
-            if value is not None
-        }
+        _validate_page_size(page_size)
+
+        filter_params = {}
+        if unit_id is not None:
+            filter_params["filterBy[processUnitId]"] = unit_id
+        if name is not None:
+            filter_params["filterBy[name]"] = name
 
         projects = project_type.requests(self)
 
         result = Result[project_type](
             offset=offset,
-            limit=10,
+            limit=page_size,
             query_params=filter_params,
             requests=projects,
         )
@@ -252,11 +558,14 @@ class DataHowLabClient:
 
     """
 
+    __slots__ = ("_client",)
+
     def __init__(
         self,
         auth_key: APIKeyAuthentication,
         base_url: str,
         verify_ssl: Union[bool, str] = True,
+        max_concurrency: int = CONNECTION_POOL_SIZE,
     ):
         """
         Parameters
@@ -270,6 +579,9 @@ class DataHowLabClient:
             TLS certificate, or a string, in which case it must be a path to a CA bundle
             to use. For more info check the documentation for python's requests.request.
             By default True.
+        max_concurrency : int, optional
+            The maximum number of requests in flight to the application, shared by
+            the clients of the same URL and limit, by default 32.
 
         Returns
         -------
@@ -280,12 +592,15 @@ class DataHowLabClient:
         if isinstance(verify_ssl, bool) and not verify_ssl:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-        self._client = Client(auth_key, base_url, verify=verify_ssl)
+        self._client = Client(
+            auth_key, base_url, verify=verify_ssl, max_concurrency=max_concurrency
+        )
 
     def get_projects(
         self,
         name: Optional[str] = None,
         project_type: Literal["cultivation", "spectroscopy"] = "cultivation",
+        page_size: int = DEFAULT_PAGE_SIZE,
     ) -> Result[Project]:
         """
         Retrieves an iterable of Spectra projects from the DHL API.
@@ -298,6 +613,8 @@ class DataHowLabClient:
             An integer representing the number of projects to skip before returning results.
         project_type : Literal["cultivation", "spectroscopy"], optional
             The type of project to retrieve, by default 'cultivation'
+        page_size : int, optional
+            The number of projects fetched per request, by default 100
 
         Returns
         -------
@@ -305,21 +622,25 @@ class DataHowLabClient:
             An Iterable object containing the retrieved projects
         """
 
-        if project_type not in PROJECT_TYPE_MAP:
+        try:
+            (unit_id, project_class) = PROJECT_TYPE_MAP[project_type]
+        except KeyError as err:
             raise ValueError(
                 f"Type must be one of {list(PROJECT_TYPE_MAP.keys())}, but got '{project_type}'"
-            )
-
-        (unit_id, project_class) = PROJECT_TYPE_MAP[project_type]
+            ) from err
 
         return self._client.get_projects(
             name=name,
             unit_id=unit_id,
             project_type=project_class,
+            page_size=page_size,
         )
 
     def get_experiments(
-        self, name: Optional[str] = None, product: Optional[Product] = None
+        self,
+        name: Optional[str] = None,
+        product: Optional[Product] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
     ) -> Result[Experiment]:
         """Retrieve the available experiments for the user
 
@@ -329,6 +650,8 @@ class DataHowLabClient:
             Search in DB by name, by default None
         product : Product, optional
             Filter experiments by product, by default None
+        page_size : int, optional
+            The number of experiments fetched per request, by default 100
 
         Returns
         -------
@@ -338,32 +661,34 @@ class DataHowLabClient:
 
         product_id = product.id if product else None
 
-        filter_params = {
-            key: value
-            for key, value in {
-                "search": name,
-                "filterBy[product._id]": product_id,
-            }.items()
-            if value is not None
-        }
+        filter_params = {}
+        if name is not None:
+            filter_params["search"] = name
+        if product_id is not None:
+            filter_params["filterBy[product._id]"] = product_id
 
         experiments = Experiment.requests(self._client)
+        _validate_page_size(page_size)
         result = Result[Experiment](
             offset=0,
-            limit=10,
+            limit=page_size,
             query_params=filter_params,
             requests=experiments,
         )
 
         return result
 
-    def get_products(self, code: Optional[str] = None) -> Result[Product]:
+    def get_products(
+        self, code: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Result[Product]:
         """Retrieve the available products for the user
 
         Parameters
         ----------
         code : str, optional
             Filter products by code, by default None
+        page_size : int, optional
+            The number of products fetched per request, by default 100
 
         Returns
         -------
@@ -374,9 +699,10 @@ class DataHowLabClient:
         filter_params = {"filterBy[code]": code} if code else None
 
         projects = Product.requests(self._client)
+        _validate_page_size(page_size)
         result = Result[Product](
             offset=0,
-            limit=10,
+            limit=page_size,
             query_params=filter_params,
             requests=projects,
         )
@@ -390,6 +716,7 @@ class DataHowLabClient:
         variable_type: Optional[
             Literal["categorical", "flow", "logical", "numeric"]
         ] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
     ) -> Result[Variable]:
         """Retrieve the available variables for the user
 
@@ -397,6 +724,8 @@ class DataHowLabClient:
         ----------
         code : str, optional
             Filter variables by code, by default None
+        page_size : int, optional
+            The number of variables fetched per request, by default 100
 
         Returns
         -------
@@ -404,12 +733,7 @@ class DataHowLabClient:
             An Iterable object containing the retrieved variable data
         """
 
-        if variable_type and variable_type not in [
-            "categorical",
-            "flow",
-            "logical",
-            "numeric",
-        ]:
+        if variable_type and variable_type not in VARIABLE_TYPES:
             raise ValueError(
                 (
                     f"Variable Type must be one of: 'categorical', 'flow',"
@@ -432,20 +756,19 @@ class DataHowLabClient:
         else:
             group_id = None
 
-        filter_params = {
-            key: value
-            for key, value in {
-                "filterBy[code]": code,
-                "filterBy[variant]": variable_type,
-                "filterBy[group._id]": group_id,
-            }.items()
-            if value is not None
-        }
+        filter_params = {}
+        if code is not None:
+            filter_params["filterBy[code]"] = code
+        if variable_type is not None:
+            filter_params["filterBy[variant]"] = variable_type
+        if group_id is not None:
+            filter_params["filterBy[group._id]"] = group_id
 
         projects = Variable.requests(self._client)
+        _validate_page_size(page_size)
         result = Result[Variable](
             offset=0,
-            limit=10,
+            limit=page_size,
             query_params=filter_params,
             requests=projects,
         )
@@ -453,7 +776,10 @@ class DataHowLabClient:
         return result
 
     def get_recipes(
-        self, name: Optional[str] = None, product: Optional[Product] = None
+        self,
+        name: Optional[str] = None,
+        product: Optional[Product] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
     ) -> Result[Recipe]:
         """Retrieve the available recipes for the user
 
@@ -463,6 +789,8 @@ class DataHowLabClient:
             Filter recipes by name, by default None
         product : Product, optional
             Filter recipes by product, by default None
+        page_size : int, optional
+            The number of recipes fetched per request, by default 100
 
         Returns
         -------
@@ -472,19 +800,17 @@ class DataHowLabClient:
 
         product_id = product.id if product else None
 
-        filter_params = {
-            key: value
-            for key, value in {
-                "filterBy[name]": name,
-                "filterBy[product._id]": product_id,
-            }.items()
-            if value is not None
-        }
+        filter_params = {}
+        if name is not None:
+            filter_params["filterBy[name]"] = name
+        if product_id is not None:
+            filter_params["filterBy[product._id]"] = product_id
 
         recipes = Recipe.requests(self._client)
+        _validate_page_size(page_size)
         result = Result[Recipe](
             offset=0,
-            limit=10,
+            limit=page_size,
             query_params=filter_params,
             requests=recipes,
         )
@@ -510,3 +836,8 @@ class DataHowLabClient:
             return entity.requests(self._client).create(entity.create_request_body())
         else:
             return entity
+
+    def cache_clear(self) -> None:
+        """Clear the products and variables cached by the client, so that
+        they are requested again from the API"""
+        self._client.entity_cache.clear()
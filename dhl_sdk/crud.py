@@ -14,11 +14,19 @@ Classes:
       and iterating through them.
 """
 
-from collections import deque
-from typing import Any, Generic, Optional, Protocol, TypeVar
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Generic, Iterator, Optional, Protocol, TypeVar
 
 from requests import Response
 
+try:
+    from pydantic_core import from_json
+except ImportError:  # pydantic-core before 2.14, i.e. pydantic before 2.5
+    from json import loads as from_json
+
 
 class Client(Protocol):
     def post(self, path: str, json_data: Any) -> Response:
@@ -45,18 +53,107 @@ class Constructor(Protocol[T]):
         ...
 
 
+def decode_json(response: Response) -> Any:
+    """Decode the JSON body of a response.
+
+    pydantic's parser decodes the list responses of the API faster
+    than the json module used by `response.json()`. Bodies that are
+    not valid JSON raise `requests.JSONDecodeError`, as with `response.json()`.
+    """
+    try:
+        return from_json(response.content)
+    except ValueError:
+        # let `requests` raise the JSONDecodeError callers expect for invalid bodies
+        return response.json()
+
+
+# fetches the next pages of results in the background while the current one is used
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="dhl-prefetch"
+)
+
+# maximum number of pages of a Result requested ahead of the one being consumed
+MAX_PREFETCH_PAGES = 4
+
+# number of entities kept by an EntityCache and seconds before they are requested again
+ENTITY_CACHE_SIZE = 256
+ENTITY_CACHE_TTL = 60
+
+
+class EntityCache:
+    """Bounded LRU of the responses of `CRUDClient.get` of a client, by URL.
+
+    The responses are kept instead of the entities, so that every
+    caller gets its own entity to modify.
+    """
+
+    __slots__ = ("_entries", "_lock")
+
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[float, Response]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Response]:
+        """Get the response stored for the key, if it did not expire"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: str, response: Response) -> None:
+        """Store a response, evicting the least recently used one when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ENTITY_CACHE_TTL, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > ENTITY_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all stored responses"""
+        with self._lock:
+            self._entries.clear()
+
+
 class CRUDClient(Generic[T]):
     """Utility class for handling CRUD requests for API entities"""
 
-    def __init__(self, client: Client, base_url: str, constructor: Constructor[T]):
+    def __init__(
+        self,
+        client: Client,
+        base_url: str,
+        constructor: Constructor[T],
+        cached: bool = False,
+    ):
         self._client = client
         self._base_url = base_url
         self._constructor = constructor
+        # the entities are cached in the `entity_cache` of the client, if it has one
+        cache = getattr(client, "entity_cache", None) if cached else None
+        self._cache = cache if isinstance(cache, EntityCache) else None
 
     def get(self, entity_id: str) -> T:
-        """Get an entity by its ID from the API"""
-        response = self._client.get(f"{self._base_url}/{entity_id}")
-        entity = response.json()
+        """Get an entity by its ID from the API.
+
+        When cached, entities requested in the last `ENTITY_CACHE_TTL`
+        seconds are built from the cached response.
+        """
+        path = f"{self._base_url}/{entity_id}"
+        if self._cache is None:
+            response = self._client.get(path)
+        else:
+            response = self._cache.get(path)
+            if response is None:
+                response = self._client.get(path)
+                self._cache.put(path, response)
+        entity = decode_json(response)
         entity = self._constructor(**entity, client=self._client)
 
         return entity
@@ -64,7 +161,7 @@ class CRUDClient(Generic[T]):
     def create(self, data: dict[str, Any]) -> T:
         """Create an entity in the API"""
         response = self._client.post(self._base_url, json_data=data)
-        entity = response.json()
+        entity = decode_json(response)
         entity = self._constructor(**entity, client=self._client)
 
         return entity
@@ -72,8 +169,8 @@ class CRUDClient(Generic[T]):
     def list(
         self, offset: int, limit: int, query_params: Optional[dict[str, str]] = None
     ) -> tuple[list[T], int]:
-        query_params = query_params or {}
-        query_params |= {
+        # build a new dict, the caller's query params are shared between pages
+        query_params = (query_params or {}) | {
             "offset": str(offset),
             "limit": str(limit),
             "archived": "false",
@@ -84,12 +181,43 @@ class CRUDClient(Generic[T]):
         total = int(response.headers.get("x-total-count"))
         entities = [
             self._constructor(**entity, client=self._client)
-            for entity in response.json()
+            for entity in decode_json(response)
         ]
 
         return entities, total
 
 
+class _Prefetch:
+    """Pages of a Result that are requested ahead in the background"""
+
+    __slots__ = ("pages", "offset", "fetched")
+
+    def __init__(self, offset: int):
+        self.pages: deque[Future] = deque()
+        # offset of the first page that was not requested yet
+        self.offset = offset
+        self.fetched = 0
+
+    def request(
+        self,
+        requests: CRUDClient,
+        limit: int,
+        query_params: Optional[dict[str, str]],
+        total: int,
+    ) -> None:
+        # request the following pages while the items of the last one are
+        # consumed, requesting more pages ahead the further it was iterated
+        self.fetched += 1
+        window = min(self.fetched, MAX_PREFETCH_PAGES)
+        while len(self.pages) < window and self.offset < total:
+            self.pages.append(
+                _PREFETCH_EXECUTOR.submit(
+                    requests.list, self.offset, limit, query_params
+                )
+            )
+            self.offset += limit
+
+
 class Result(Generic[T]):
     """Utility class for handling paginated API results"""
 
@@ -106,6 +234,7 @@ class Result(Generic[T]):
         self._total = None
         self._query_params = query_params
         self._requests = requests
+        self._prefetch = _Prefetch(offset)
 
     def __iter__(self) -> "Result[T]":
         return self
@@ -115,7 +244,21 @@ class Result(Generic[T]):
             self._fetch_next()
         return self._data.popleft()
 
+    def pages(self) -> Iterator[list[T]]:
+        """Iterate over the remaining results one page at a time"""
+        while True:
+            if not self._data:
+                try:
+                    self._fetch_next()
+                except StopIteration:
+                    return
+            page = list(self._data)
+            self._data.clear()
+            yield page
+
     def __len__(self) -> int:
+        # the total is known once a page was loaded, otherwise only count
+        # the results instead of building the entities of a whole page
         if self._total is None:
             _, total = self._requests.list(
                 0,
@@ -126,11 +269,20 @@ class Result(Generic[T]):
         return self._total
 
     def _fetch_next(self) -> None:
-        entities, total = self._requests.list(
-            self.offset,
-            self.limit,
-            self._query_params,
-        )
+        # the total of the last page tells when there is nothing left to request
+        if not self._prefetch.pages and self._total is not None:
+            if self.offset >= self._total:
+                raise StopIteration("No results available in the API")
+
+        if self._prefetch.pages:
+            entities, total = self._prefetch.pages.popleft().result()
+        else:
+            entities, total = self._requests.list(
+                self.offset,
+                self.limit,
+                self._query_params,
+            )
+            self._prefetch.offset = self.offset + self.limit
 
         self.offset += self.limit
         self._data.extend(entities)
@@ -139,6 +291,8 @@ class Result(Generic[T]):
         if len(self._data) == 0:
             raise StopIteration("No results available in the API")
 
+        self._prefetch.request(self._requests, self.limit, self._query_params, total)
+
     def is_empty(self) -> bool:
         """Check if the result is empty"""
         return self._total == 0
@@ -16,8 +16,10 @@ Classes:
 import copy
 import csv
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from io import StringIO
+from types import MappingProxyType
 from typing import Literal, Optional, Union
 
 from pydantic import BaseModel, Field, PrivateAttr, model_validator
@@ -31,7 +33,7 @@ from dhl_sdk._utils import (
     VARIABLES_URL,
     VariableGroupCodes,
 )
-from dhl_sdk.crud import Client, CRUDClient, DataBaseClient
+from dhl_sdk.crud import Client, CRUDClient, DataBaseClient, decode_json
 from dhl_sdk.exceptions import ImportValidationException, NewEntityException
 from dhl_sdk.importers import RunFileImporter, SpectraFileImporter
 from dhl_sdk.validators import (
@@ -45,6 +47,9 @@ from dhl_sdk.validators import (
     VariableValidator,
 )
 
+# maximum number of experiment files downloaded at the same time
+MAX_DOWNLOAD_WORKERS = 8
+
 
 class DataBaseEntity(ABC):
     """Abstract class for DataBase Entities
@@ -278,18 +283,23 @@ class Variant(str, Enum):
 
     def get_variant_details(self, **kwargs) -> VariantDetails:
         """get variant details"""
-        if self == Variant.FLOW:
-            return VariableFlow(**kwargs)
-        if self == Variant.NUMERIC:
-            return VariableNumeric(**kwargs)
-        if self == Variant.CATEGORICAL:
-            return VariableCategorical(**kwargs)
-        if self == Variant.LOGICAL:
-            return VariableLogical(**kwargs)
-        if self == Variant.SPECTRUM:
-            return VariableSpectrum(**kwargs)
-
-        raise ValueError(f"Variant {self} not supported")
+        try:
+            details_class = VARIANT_DETAILS_MAP[self]
+        except KeyError as err:
+            raise ValueError(f"Variant {self} not supported") from err
+
+        return details_class(**kwargs)
+
+
+VARIANT_DETAILS_MAP = MappingProxyType(
+    {
+        Variant.FLOW: VariableFlow,
+        Variant.NUMERIC: VariableNumeric,
+        Variant.CATEGORICAL: VariableCategorical,
+        Variant.LOGICAL: VariableLogical,
+        Variant.SPECTRUM: VariableSpectrum,
+    }
+)
 
 
 class Variable(BaseModel, DataBaseEntity):
@@ -489,7 +499,7 @@ class Variable(BaseModel, DataBaseEntity):
     @staticmethod
     def requests(client: Client) -> CRUDClient["Variable"]:
         # pylint: disable=missing-function-docstring
-        return CRUDClient["Variable"](client, VARIABLES_URL, Variable)
+        return CRUDClient["Variable"](client, VARIABLES_URL, Variable, cached=True)
 
 
 class Product(BaseModel, DataBaseEntity):
@@ -551,7 +561,7 @@ class Product(BaseModel, DataBaseEntity):
     @staticmethod
     def requests(client: Client) -> CRUDClient["Product"]:
         # pylint: disable=missing-function-docstring
-        return CRUDClient["Product"](client, PRODUCTS_URL, Product)
+        return CRUDClient["Product"](client, PRODUCTS_URL, Product, cached=True)
 
 
 class File(BaseModel):
@@ -633,6 +643,18 @@ class File(BaseModel):
         # pylint: disable=missing-function-docstring
         return client.get(f"{FILES_URL}/{file_id}/data")
 
+    @staticmethod
+    def download_all(client: Client, file_ids: list[str]) -> dict[str, Response]:
+        """Download the data of each file once, concurrently for several files"""
+        file_ids = list(dict.fromkeys(file_ids))
+        if len(file_ids) <= 1:
+            return {file_id: File.download(client, file_id) for file_id in file_ids}
+
+        max_workers = min(len(file_ids), MAX_DOWNLOAD_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = executor.map(lambda id_: File.download(client, id_), file_ids)
+            return dict(zip(file_ids, responses))
+
 
 class Instances(BaseModel):
     """Pydantic model for Unresolved Instances"""
@@ -838,22 +860,29 @@ class Experiment(BaseModel, DataBaseEntity):
 
         """
 
-        cache = {}
+        instances = list(zip(self.instances, self.variables))
+
+        # each file is downloaded once, even if it holds several variables
+        cache = File.download_all(
+            client._client, [instance.fileId for instance, _ in instances]
+        )
+
+        timeseries = {}
         experiment_data = {}
 
-        for instance, variable in zip(self.instances, self.variables):
-            if instance.fileId not in cache:
-                response = File.download(client._client, instance.fileId)
-                cache[instance.fileId] = response
-            else:
-                response = cache[instance.fileId]
+        for instance, variable in instances:
+            response = cache[instance.fileId]
 
             if instance.column in experiment_data:
                 continue
 
             if response.headers["content-type"] == "application/json":
-                data = response.json()
-                experiment_data[variable.code] = data["timeseries"][instance.column]
+                # files shared by several variables are decoded once
+                if instance.fileId not in timeseries:
+                    timeseries[instance.fileId] = decode_json(response)["timeseries"]
+                experiment_data[variable.code] = timeseries[instance.fileId][
+                    instance.column
+                ]
 
             elif response.headers["content-type"] == "text/csv":
                 csv_data = [row for row in csv.reader(StringIO(response.text))]
@@ -12,6 +12,8 @@ Classes:
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Literal, Optional, Type, Union
 
 from pydantic import BaseModel, Field, PrivateAttr, model_validator
@@ -34,7 +36,7 @@ from dhl_sdk._utils import (
     PredictResponse,
     get_id_list,
 )
-from dhl_sdk.crud import Client, CRUDClient, DataBaseClient, Result
+from dhl_sdk.crud import Client, CRUDClient, DataBaseClient, Result, decode_json
 from dhl_sdk.db_entities import Experiment, Variable
 from dhl_sdk.exceptions import (
     InvalidInputsException,
@@ -42,6 +44,9 @@ from dhl_sdk.exceptions import (
     PredictionRequestException,
 )
 
+# maximum number of prediction requests (batches) sent at the same time
+MAX_PREDICTION_WORKERS = 4
+
 
 class IdEntity(BaseModel):
     """Model for Entities only containing an id"""
@@ -76,9 +81,11 @@ class Dataset(BaseModel):
                     - "timestamps": list with the timestamps for each value
         """
 
+        experiment_requests = Experiment.requests(self._client)
+
         run_data = []
         for experiment in self.experiments:
-            exp = Experiment.requests(self._client).get(experiment.id)
+            exp = experiment_requests.get(experiment.id)
             data = exp.get_data(client=client)
             run_data.append(data)
 
@@ -87,6 +94,7 @@ class Dataset(BaseModel):
     @model_validator(mode="before")
     @classmethod
     def _validate_variables(cls, data) -> dict:
+        variable_requests = Variable.requests(data["client"])
         unpacked_variables = []
 
         for i, variable_info in enumerate(data["variables"]):
@@ -97,7 +105,7 @@ class Dataset(BaseModel):
                     f"The variable at index {i} does not contain an id"
                 ) from err
 
-            var = Variable.requests(data["client"]).get(var_id)
+            var = variable_requests.get(var_id)
             unpacked_variables.append(var)
 
         data["variables"] = unpacked_variables
@@ -142,6 +150,7 @@ class Model(BaseModel, ABC):
     dataset: Dataset = Field(alias="dataset")
     config: dict = Field(alias="config")
     _client: Client = PrivateAttr()
+    _model_variables: Optional[list[Variable]] = PrivateAttr(default=None)
 
     @property
     def success(self) -> bool:
@@ -165,26 +174,43 @@ class Model(BaseModel, ABC):
 
         predict_url = f"{PREDICT_URL}/{self.id}/predict"
 
-        predictions = []
-        for prediction_data in json_data:
-            try:
-                response = self._client.post(predict_url, prediction_data)
-                response.raise_for_status()
+        if len(json_data) == 1:
+            predictions = [self._post_prediction(predict_url, json_data[0])]
+        else:
+            # send the batches concurrently, the results keep the batches order
+            max_workers = min(len(json_data), MAX_PREDICTION_WORKERS)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                predictions = list(
+                    executor.map(
+                        lambda data: self._post_prediction(predict_url, data),
+                        json_data,
+                    )
+                )
+
+        return format_predictions(predictions, model=self)
 
-                # in case of an error in the response (not HTTP)
-                if "error" in response.json():
-                    raise PredictionRequestException(response.json()["error"])
+    def _post_prediction(self, predict_url: str, data: dict) -> PredictResponse:
+        """Send one prediction request and parse its response"""
 
-            except Exception as ex:
-                raise ex
+        response = self._client.post(predict_url, data)
+        response.raise_for_status()
 
-            predictions.append(PredictResponse(**response.json()))
+        # in case of an error in the response (not HTTP)
+        prediction = decode_json(response)
+        if "error" in prediction:
+            raise PredictionRequestException(prediction["error"])
 
-        return format_predictions(predictions, model=self)
+        return PredictResponse(**prediction)
 
     @property
-    def model_variables(self) -> dict:
+    def model_variables(self) -> list[Variable]:
         """List of the variables used in the model"""
+        if self._model_variables is None:
+            self._model_variables = self._get_model_variables()
+        return self._model_variables
+
+    def _get_model_variables(self) -> list[Variable]:
+        """Get the variables used in the model from the dataset and model config"""
 
         model_variables = []
         groups = self.config["groups"]
@@ -470,10 +496,12 @@ class CultivationHistoricalModel(CultivationModel):
 class ModelFactory:
     """Factory for Model, given the process unit id and model type"""
 
-    MODEL_MAP = {
-        "373c173a-1f23-4e56-874e-90ca4702ec0d": SpectraModel,
-        "04a324da-13a5-470b-94a1-bda6ac87bb86": CultivationModel,
-    }
+    MODEL_MAP = MappingProxyType(
+        {
+            "373c173a-1f23-4e56-874e-90ca4702ec0d": SpectraModel,
+            "04a324da-13a5-470b-94a1-bda6ac87bb86": CultivationModel,
+        }
+    )
 
     def __init__(self, process_unit_id):
         self._process_unit_id = process_unit_id
@@ -649,7 +677,9 @@ class CultivationProject(Project):
             "filterByTag[type]": model_type,
             "archived": "any",
         }
-        template_list = self._client.get(TEMPLATES_URL, template_query_params).json()
+        template_list = decode_json(
+            self._client.get(TEMPLATES_URL, template_query_params)
+        )
         template_ids = get_id_list(template_list)
 
         query_params.update({"filterBy[templateId]": "|".join(template_ids)})
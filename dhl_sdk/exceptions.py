@@ -16,8 +16,12 @@ Exceptions:
     - PredictionRequestException: Exception raised when prediction request fails
     - ImportValidationException: Exception raised when import validation fails
     - NewEntityException: Exception raised when creating new entity fails
+    - ServiceUnavailableException: Exception raised when requests are not sent
+      because the API keeps failing
 """
 
+import requests
+
 
 class InvalidSpectraException(Exception):
     """Exception raised when spectra used for prediction are not valid"""
@@ -89,3 +93,11 @@ class NewEntityException(Exception):
     def __init__(self, message="Creating new entity failed."):
         self.message = message
         super().__init__(self.message)
+
+
+class ServiceUnavailableException(requests.ConnectionError):
+    """Exception raised when requests are not sent because the API keeps failing"""
+
+    def __init__(self, message="The DataHowLab API is unavailable."):
+        self.message = message
+        super().__init__(self.message)
@@ -2,11 +2,13 @@
 
 # pylint: disable=missing-function-docstring, arguments-differ, protected-access
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
 from typing import Any, Dict, Literal, Protocol
 
 from dhl_sdk._utils import FILES_URL
-from dhl_sdk.crud import Client
+from dhl_sdk.crud import Client, decode_json
+from dhl_sdk.exceptions import ImportValidationException
 
 
 class File(Protocol):
@@ -30,7 +32,7 @@ class RunFileImporter:
         """Import the run file to the project and dataset"""
 
         response = self.client.post(FILES_URL, file.create_request_body())
-        file_id = response.json()["id"]
+        file_id = decode_json(response)["id"]
 
         import_data = {"timeseries": file._data}
 
@@ -52,31 +54,48 @@ class SpectraFileImporter:
     def import_file(self, file: File) -> tuple[str, str]:
         """Import the spectra file to the project and dataset"""
 
-        # Create Spectra file
-        response = self.client.post(FILES_URL, self._file_spectra_body(file))
-        spectra_file_id = response.json()["id"]
-
-        import_data = self._spectra_data(file._data, file.variant)
-
-        self.client.put(
-            f"{FILES_URL}/{spectra_file_id}/data",
-            data=import_data,
-            content_type="text/csv",
-        )
-
-        # Create Targets file
-        response = self.client.post(FILES_URL, self._file_vars_body(file))
-        vars_file_id = response.json()["id"]
-
-        import_data = self._variables_data(file._data, file.variant)
+        # build both payloads first, the targets data no longer has the spectra
+        spectra_body = self._file_spectra_body(file)
+        spectra_data = self._spectra_data(file._data, file.variant)
+        vars_body = self._file_vars_body(file)
+        vars_data = self._variables_data(file._data, file.variant)
+
+        # the spectra and targets files are independent, upload them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            uploads = [
+                executor.submit(self._upload, spectra_body, spectra_data, "text/csv"),
+                executor.submit(self._upload, vars_body, vars_data, "application/json"),
+            ]
+
+        # when one upload fails, the other file may have been created already
+        errors = [upload.exception() for upload in uploads]
+        for error in errors:
+            if error is not None:
+                created = [
+                    upload.result()
+                    for upload, upload_error in zip(uploads, errors)
+                    if upload_error is None
+                ]
+                raise ImportValidationException(
+                    f"Uploading the file data failed: {error}. "
+                    f"Files created before the failure: {', '.join(created) or 'none'}"
+                ) from error
+
+        return (uploads[0].result(), uploads[1].result())
+
+    def _upload(self, body: Dict[str, Any], data: Any, content_type: str) -> str:
+        """Create a file and upload its data, returning the new file id"""
+
+        response = self.client.post(FILES_URL, body)
+        file_id = decode_json(response)["id"]
 
         self.client.put(
-            f"{FILES_URL}/{vars_file_id}/data",
-            data=import_data,
-            content_type="application/json",
+            f"{FILES_URL}/{file_id}/data",
+            data=data,
+            content_type=content_type,
         )
 
-        return (spectra_file_id, vars_file_id)
+        return file_id
 
     def _file_spectra_body(self, file: File) -> Dict[str, Any]:
         """Create the request body for the spectra file"""
@@ -113,11 +132,13 @@ class SpectraFileImporter:
         csv_data = StringIO()
         csv_writer = csv.writer(csv_data)
 
-        # Write data rows
-        for timestamp, value_list in zip(
-            spectra_data[sample_id], spectra_data["values"]
-        ):
-            csv_writer.writerow([timestamp] + value_list)
+        # Write data rows, in a single call that consumes the rows lazily
+        csv_writer.writerows(
+            [timestamp, *value_list]
+            for timestamp, value_list in zip(
+                spectra_data[sample_id], spectra_data["values"]
+            )
+        )
 
         csv_string = csv_data.getvalue()
         csv_data.close()
@@ -21,7 +21,7 @@ from dhl_sdk._utils import (
     VARIABLES_URL,
     is_date_in_format,
 )
-from dhl_sdk.crud import Client, CRUDClient
+from dhl_sdk.crud import Client, CRUDClient, decode_json
 from dhl_sdk.exceptions import ImportValidationException
 
 
@@ -158,6 +158,16 @@ class VariableValidator(AbstractValidator):
                     "Flow variables must have a list of references"
                 )
 
+            # references often point to the same variables, request each one once
+            referenced_variables = {}
+
+            def referenced_variable(variable_id: str):
+                if variable_id not in referenced_variables:
+                    referenced_variables[variable_id] = client.get(
+                        f"{VARIABLES_URL}/{variable_id}"
+                    )
+                return referenced_variables[variable_id]
+
             for reference in references:
                 if not reference.measurement_id:
                     validation_errors.append(
@@ -166,7 +176,7 @@ class VariableValidator(AbstractValidator):
                     )
                 else:
                     measurement_id = reference.measurement_id
-                    response = client.get(f"{VARIABLES_URL}/{measurement_id}")
+                    response = referenced_variable(measurement_id)
                     if response.status_code != 200:
                         validation_errors.append(
                             f"Variable with id {measurement_id} does not exist."
@@ -174,7 +184,7 @@ class VariableValidator(AbstractValidator):
                             " already in the database"
                         )
                     else:
-                        measurement = response.json()
+                        measurement = decode_json(response)
                         if measurement["group"]["code"] != "X":
                             validation_errors.append(
                                 f"Variable with id {measurement_id} must be a "
@@ -183,7 +193,7 @@ class VariableValidator(AbstractValidator):
 
                 if reference.concentration_id:
                     concentration_id = reference.concentration_id
-                    response = client.get(f"{VARIABLES_URL}/{concentration_id}")
+                    response = referenced_variable(concentration_id)
                     if response.status_code != 200:
                         validation_errors.append(
                             f"Variable with id {concentration_id} does not exist."
@@ -191,7 +201,7 @@ class VariableValidator(AbstractValidator):
                             "already in the database"
                         )
                     else:
-                        concentration = response.json()
+                        concentration = decode_json(response)
                         if concentration["group"]["code"] != "FeedConc":
                             validation_errors.append(
                                 f"Variable with id {concentration_id} must be a "
@@ -200,7 +210,7 @@ class VariableValidator(AbstractValidator):
 
                 if reference.fraction_id:
                     fraction_id = reference.fraction_id
-                    response = client.get(f"{VARIABLES_URL}/{fraction_id}")
+                    response = referenced_variable(fraction_id)
                     if response.status_code != 200:
                         validation_errors.append(
                             f"Variable with id {fraction_id} does not exist."
@@ -231,7 +241,7 @@ class VariableValidator(AbstractValidator):
 
             response = client.get(VARIABLES_URL, query_params=query_params)
             if int(response.headers.get("x-total-count")) > 0:
-                entity.id = response.json()[0]["id"]
+                entity.id = decode_json(response)[0]["id"]
                 return True
             else:
                 return False
@@ -303,7 +313,7 @@ class ProductValidator(AbstractValidator):
 
             response = client.get(PRODUCTS_URL, query_params=query_params)
             if int(response.headers.get("x-total-count")) > 0:
-                entity.id = response.json()[0]["id"]
+                entity.id = decode_json(response)[0]["id"]
                 return True
             else:
                 return False
@@ -332,6 +342,26 @@ class AbstractFileValidator(ABC):
     def is_imported(self, entity: File, client: Client) -> bool:
         """Check if the file is already imported"""
 
+    @staticmethod
+    def _variables_in_data(
+        variables: list[Variable], data: Any, validation_errors: list[str]
+    ) -> list[Variable]:
+        """Keep the variables whose code is in the data, adding an error for
+        the missing ones. Spectra variables are stored under the 'spectra' key.
+        """
+        # compare the codes case insensitively, lowering the keys once
+        data_keys = {key.lower() for key in data}
+
+        found = []
+        for variable in variables:
+            if variable.group.code != "SPC" and variable.code.lower() not in data_keys:
+                validation_errors.append(
+                    f"Variable {variable.code} is missing from the data dictionary"
+                )
+            else:
+                found.append(variable)
+        return found
+
 
 class RecipeFileValidator(AbstractFileValidator):
     """Validator for Files"""
@@ -566,13 +596,9 @@ class ExperimentFileValidator(AbstractFileValidator):
         elif variant == "samples":
             sample_id = "sampleId"
 
-        for variable in variables:
-            if variable.code.lower() not in (key.lower() for key in data):
-                validation_errors.append(
-                    f"Variable {variable.code} is missing from the data dictionary"
-                )
-                continue
+        variables = self._variables_in_data(variables, data, validation_errors)
 
+        for variable in variables:
             variable_data = data[variable.code]
             if not isinstance(variable_data, dict):
                 validation_errors.append(
@@ -702,6 +728,8 @@ class SpectraFileValidator(AbstractFileValidator):
                 ("Spectra data is missing. Please add the 'spectra' key to the data")
             )
 
+        variables = self._variables_in_data(variables, data, validation_errors)
+
         # save spectra variable in variable list
         spectra_variable = None
         for variable in variables:
@@ -715,11 +743,6 @@ class SpectraFileValidator(AbstractFileValidator):
 
             else:
                 variable_code = variable.code
-                if variable.code.lower() not in (key.lower() for key in data):
-                    validation_errors.append(
-                        f"Variable {variable.code} is missing from the data dictionary"
-                    )
-                    continue
 
             variable_data = data[variable_code]
             if not isinstance(variable_data, dict):
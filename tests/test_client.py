@@ -1,11 +1,42 @@
 # pylint: disable=missing-docstring
+import subprocess
+import sys
+import threading
+import time
 import unittest
 from unittest.mock import patch, Mock
 
+import numpy as np
+import requests
+
 from dhl_sdk.authentication import APIKeyAuthentication
-from dhl_sdk.client import Client, DataHowLabClient
+from dhl_sdk.client import Client, DataHowLabClient, _reset_breakers
 from dhl_sdk.crud import CRUDClient
+from dhl_sdk.db_entities import Experiment, Product
 from dhl_sdk.entities import CultivationProject
+from dhl_sdk.exceptions import ServiceUnavailableException
+
+EMPTY_PAGE = Mock(content=b"[]", headers={"x-total-count": "0"})
+
+
+class TestPackage(unittest.TestCase):
+    def test_lazy_import(self):
+        # the client is only loaded when one of its names is used
+        code = (
+            "import sys, dhl_sdk; "
+            "assert 'dhl_sdk.client' not in sys.modules; "
+            "dhl_sdk.DataHowLabClient; "
+            "assert 'dhl_sdk.client' in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_dir(self):
+        import dhl_sdk  # pylint: disable=import-outside-toplevel
+
+        _ = dhl_sdk.APIKeyAuthentication
+        names = dir(dhl_sdk)
+        self.assertEqual(names.count("APIKeyAuthentication"), 1)
+        self.assertTrue(set(dhl_sdk.__all__) <= set(names))
 
 
 class TestGetAPIKey(unittest.TestCase):
@@ -16,6 +47,13 @@ class TestGetAPIKey(unittest.TestCase):
         headers = auth_key.get_headers()
         self.assertEqual(headers["Authorization"], "ApiKey test_api_key")
 
+    def test_headers_follow_api_key(self):
+        auth_key = APIKeyAuthentication("first_key")
+        self.assertIs(auth_key.get_headers(), auth_key.get_headers())
+
+        auth_key.api_key = "second_key"
+        self.assertEqual(auth_key.get_headers(), {"Authorization": "ApiKey second_key"})
+
     @patch("os.environ.get", return_value=None)
     def test_no_api_key_provided(self, mock_env_get):
         # Test when no API key is provided
@@ -29,8 +67,156 @@ class TestClient(unittest.TestCase):
         self.base_url = "https://test.com"
         self.client = Client(self.auth_key, self.base_url)
 
+    def tearDown(self):
+        _reset_breakers()
+
+    def authorization(self, client):
+        request = requests.Request("GET", "https://test.com/api")
+        return client.session.prepare_request(request).headers["Authorization"]
+
     def test_init(self):
         self.assertEqual(self.client.auth_key, self.auth_key)
+        self.assertEqual(self.authorization(self.client), "ApiKey test_auth_key")
+
+        # the headers follow the API key after the client is created
+        self.auth_key.api_key = "new_key"
+        self.assertEqual(self.authorization(self.client), "ApiKey new_key")
+
+    def test_init_base_url(self):
+        client = Client(self.auth_key, "https://test.com/dhl//")
+        self.assertEqual(client.base_url, "https://test.com/dhl/")
+
+        with self.assertRaises(ValueError):
+            _ = Client(self.auth_key, "test.com")
+
+    def test_shared_adapter(self):
+        client = Client(APIKeyAuthentication("other_key"), self.base_url)
+        self.assertIs(
+            client.session.get_adapter(self.base_url),
+            self.client.session.get_adapter(self.base_url),
+        )
+        self.assertEqual(self.authorization(client), "ApiKey other_key")
+        self.assertEqual(self.authorization(self.client), "ApiKey test_auth_key")
+
+        client = Client(self.auth_key, "https://other.test.com")
+        self.assertIsNot(
+            client.session.get_adapter(self.base_url),
+            self.client.session.get_adapter(self.base_url),
+        )
+
+    def test_retry_backoff_jitter(self):
+        session = Client._get_retry_requester(backoff_factor=1)
+        retry = session.get_adapter("https://test.com").max_retries
+        for _ in range(3):
+            retry = retry.increment(method="GET", url="/api")
+
+        # full jitter: a random backoff up to the exponential one, 1 * 2 ** 2
+        backoffs = [retry.get_backoff_time() for _ in range(50)]
+        self.assertTrue(all(0 <= backoff <= 4 for backoff in backoffs))
+        self.assertGreater(len(set(backoffs)), 1)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_max_concurrency(self, mock_send):
+        in_flight = []
+        peak = []
+        release = threading.Event()
+        lock = threading.Lock()
+
+        def send(*args, **kwargs):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            release.wait(5)
+            with lock:
+                in_flight.pop()
+            response = requests.Response()
+            response.status_code = 200
+            return response
+
+        mock_send.side_effect = send
+        client = Client(self.auth_key, "https://bulkhead.test", max_concurrency=2)
+        threads = [
+            threading.Thread(target=client.get, args=("api/test",)) for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+
+        # the other requests wait for a slot instead of being sent
+        time.sleep(0.2)
+        self.assertEqual(mock_send.call_count, 2)
+
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(mock_send.call_count, 5)
+        self.assertEqual(max(peak), 2)
+
+        with self.assertRaises(ValueError):
+            _ = Client(self.auth_key, self.base_url, max_concurrency=0)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_circuit_breaker(self, mock_send):
+        session = Client._get_retry_requester()
+        mock_send.side_effect = requests.ConnectionError("connection refused")
+
+        for _ in range(5):
+            with self.assertRaises(requests.ConnectionError):
+                session.get("https://breaker.test/api")
+
+        # the host is not requested anymore until the recovery timeout is over
+        with self.assertRaises(ServiceUnavailableException):
+            session.get("https://breaker.test/api")
+        self.assertEqual(mock_send.call_count, 5)
+
+        response = requests.Response()
+        response.status_code = 200
+        mock_send.side_effect = None
+        mock_send.return_value = response
+        with patch("dhl_sdk.client.time.monotonic", return_value=time.monotonic() + 31):
+            session.get("https://breaker.test/api")
+        session.get("https://breaker.test/api")
+        self.assertEqual(mock_send.call_count, 7)
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_circuit_breaker_server_errors(self, mock_send):
+        session = Client._get_retry_requester(total_retries=0)
+        response = requests.Response()
+        response.status_code = 500
+        mock_send.return_value = response
+
+        # errors of the requests themselves do not pause the host
+        for _ in range(6):
+            session.get("https://breaker.test/api")
+        self.assertEqual(mock_send.call_count, 6)
+
+        response.status_code = 503
+        for _ in range(5):
+            session.get("https://breaker.test/api")
+        with self.assertRaises(ServiceUnavailableException):
+            session.get("https://breaker.test/api")
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_circuit_breaker_interrupted_trial(self, mock_send):
+        session = Client._get_retry_requester()
+        mock_send.side_effect = requests.ConnectionError("connection refused")
+        for _ in range(5):
+            with self.assertRaises(requests.ConnectionError):
+                session.get("https://breaker.test/api")
+
+        later = time.monotonic() + 31
+        mock_send.side_effect = KeyboardInterrupt
+        with patch("dhl_sdk.client.time.monotonic", return_value=later):
+            with self.assertRaises(KeyboardInterrupt):
+                session.get("https://breaker.test/api")
+
+        # the interrupted trial does not keep the host paused
+        response = requests.Response()
+        response.status_code = 200
+        mock_send.side_effect = None
+        mock_send.return_value = response
+        with patch("dhl_sdk.client.time.monotonic", return_value=later):
+            session.get("https://breaker.test/api")
+        self.assertEqual(mock_send.call_count, 7)
 
     @patch("requests.Session.post")
     def test_post(self, mock_post):
@@ -38,8 +224,33 @@ class TestClient(unittest.TestCase):
         self.client.post("api/test", json_data)
         mock_post.assert_called_once_with(
             "https://test.com/api/test",
-            headers={"Authorization": "ApiKey test_auth_key"},
-            json=json_data,
+            headers={"Content-Type": "application/json"},
+            data=b'{"test_key":"test_value"}',
+        )
+
+    @patch("requests.Session.post")
+    def test_post_invalid_json(self, mock_post):
+        with self.assertRaises(requests.exceptions.InvalidJSONError):
+            self.client.post("api/test", {"values": [1.0, float("inf")]})
+        mock_post.assert_not_called()
+
+    @patch("requests.Session.post")
+    def test_post_not_serializable(self, mock_post):
+        with self.assertRaises(TypeError):
+            self.client.post("api/test", {"steps": np.int64(1)})
+        mock_post.assert_not_called()
+
+    @patch("requests.Session.put")
+    def test_put_invalid_json(self, mock_put):
+        with self.assertRaises(requests.exceptions.InvalidJSONError):
+            self.client.put("api/test", {"values": [1.0, float("nan")]})
+        mock_put.assert_not_called()
+
+        self.client.put("api/test", {"name": "NaN"})
+        mock_put.assert_called_once_with(
+            "https://test.com/api/test",
+            headers={"Content-Type": "application/json"},
+            data=b'{"name":"NaN"}',
         )
 
     @patch("requests.Session.get")
@@ -49,10 +260,47 @@ class TestClient(unittest.TestCase):
         self.client.get("api/test", query_params)
         mock_get.assert_called_once_with(
             "https://test.com/api/test?offset=0&limit=10&filterBy[name]=foo%25%3Dbar",
-            headers={"Authorization": "ApiKey test_auth_key"},
+        )
+
+    @patch("requests.Session.get")
+    def test_get_sequence_query_params(self, mock_get):
+        query_params = {"filterBy[code]": ["a b", "c"], "limit": 10}
+
+        self.client.get("api/test", query_params)
+        mock_get.assert_called_once_with(
+            "https://test.com/api/test?filterBy[code]=a+b&filterBy[code]=c&limit=10",
         )
 
     @patch("dhl_sdk.client.Client.get")
+    def test_cache_clear(self, mock_get):
+        client = DataHowLabClient(self.auth_key, self.base_url)
+        mock_get.return_value = Mock(
+            content=b'{"id": "prod-id", "code": "PROD", "name": "product"}'
+        )
+
+        products = Product.requests(client._client)
+        self.assertEqual(products.get("prod-id").code, "PROD")
+        self.assertIsNot(products.get("prod-id"), products.get("prod-id"))
+        mock_get.assert_called_once_with("api/db/v2/products/prod-id")
+
+        # checking if a product is imported always asks the API
+        product = products.get("prod-id")
+        mock_get.return_value.status_code = 200
+        self.assertTrue(product._validator.is_imported(product, client._client))
+        self.assertEqual(mock_get.call_count, 2)
+
+        client.cache_clear()
+        products.get("prod-id")
+        self.assertEqual(mock_get.call_count, 3)
+
+        # other entities are always requested
+        with self.assertRaises(ValueError):
+            Experiment.requests(client._client).get("exp-id")
+        with self.assertRaises(ValueError):
+            Experiment.requests(client._client).get("exp-id")
+        self.assertEqual(mock_get.call_count, 5)
+
+    @patch("dhl_sdk.client.Client.get", return_value=EMPTY_PAGE)
     def test_get_projects(self, mock_get):
         offset = 0
         name = "test_name"
@@ -72,7 +320,7 @@ class TestClient(unittest.TestCase):
             "api/db/v2/projects",
             query_params={
                 "offset": "0",
-                "limit": "10",
+                "limit": "100",
                 "filterBy[name]": name,
                 "filterBy[processUnitId]": unit_id,
                 "archived": "false",
@@ -80,7 +328,7 @@ class TestClient(unittest.TestCase):
             },
         )
 
-    @patch("dhl_sdk.client.Client.get")
+    @patch("dhl_sdk.client.Client.get", return_value=EMPTY_PAGE)
     def test_get_products(self, mock_get):
         client = DataHowLabClient(self.auth_key, self.base_url)
         code = "TESTCODE"
@@ -94,14 +342,36 @@ class TestClient(unittest.TestCase):
             "api/db/v2/products",
             query_params={
                 "offset": "0",
-                "limit": "10",
+                "limit": "100",
                 "filterBy[code]": code,
                 "archived": "false",
                 "sortBy[createdAt]": "desc",
             },
         )
 
-    @patch("dhl_sdk.client.Client.get")
+    @patch("dhl_sdk.client.Client.get", return_value=EMPTY_PAGE)
+    def test_get_products_page_size(self, mock_get):
+        client = DataHowLabClient(self.auth_key, self.base_url)
+
+        with self.assertRaises(ValueError):
+            _ = client.get_products(page_size=0)
+
+        with self.assertRaises(StopIteration):
+            # it should raise an error since there is no data
+            result = client.get_products(page_size=500)
+            _ = next(result)
+
+        mock_get.assert_called_once_with(
+            "api/db/v2/products",
+            query_params={
+                "offset": "0",
+                "limit": "500",
+                "archived": "false",
+                "sortBy[createdAt]": "desc",
+            },
+        )
+
+    @patch("dhl_sdk.client.Client.get", return_value=EMPTY_PAGE)
     def test_get_recipes(self, mock_get):
         client = DataHowLabClient(self.auth_key, self.base_url)
         name = "test name"
@@ -120,7 +390,7 @@ class TestClient(unittest.TestCase):
             "api/db/v2/recipes",
             query_params={
                 "offset": "0",
-                "limit": "10",
+                "limit": "100",
                 "filterBy[name]": name,
                 "filterBy[product._id]": product.id,
                 "archived": "false",
@@ -128,7 +398,7 @@ class TestClient(unittest.TestCase):
             },
         )
 
-    @patch("dhl_sdk.client.Client.get")
+    @patch("dhl_sdk.client.Client.get", return_value=EMPTY_PAGE)
     def test_get_experiments(self, mock_get):
         client = DataHowLabClient(self.auth_key, self.base_url)
         name = "test name"
@@ -147,7 +417,7 @@ class TestClient(unittest.TestCase):
             "api/db/v2/experiments",
             query_params={
                 "offset": "0",
-                "limit": "10",
+                "limit": "100",
                 "search": "test name",
                 "filterBy[product._id]": product.id,
                 "archived": "false",
@@ -155,7 +425,7 @@ class TestClient(unittest.TestCase):
             },
         )
 
-    @patch("dhl_sdk.client.Client.get")
+    @patch("dhl_sdk.client.Client.get", return_value=EMPTY_PAGE)
     def test_get_experiments_noproduct(self, mock_get):
         client = DataHowLabClient(self.auth_key, self.base_url)
         name = "test name"
@@ -169,14 +439,14 @@ class TestClient(unittest.TestCase):
             "api/db/v2/experiments",
             query_params={
                 "offset": "0",
-                "limit": "10",
+                "limit": "100",
                 "search": "test name",
                 "archived": "false",
                 "sortBy[createdAt]": "desc",
             },
         )
 
-    @patch("dhl_sdk.client.Client.get")
+    @patch("dhl_sdk.client.Client.get", return_value=EMPTY_PAGE)
     def test_get_variables(self, mock_get):
         client = DataHowLabClient(self.auth_key, self.base_url)
         code = "TESTCODE"
@@ -214,7 +484,7 @@ class TestClient(unittest.TestCase):
                 "api/db/v2/variables",
                 query_params={
                     "offset": "0",
-                    "limit": "10",
+                    "limit": "100",
                     "filterBy[code]": code,
                     "filterBy[variant]": variable_type,
                     "filterBy[group._id]": "959606c1-44bc-4657-82ff-70c247be14aa",
@@ -1,7 +1,9 @@
 # pylint: disable=missing-docstring
+import json
 import unittest
 from unittest.mock import Mock, call, patch
 
+import requests
 from pydantic import ValidationError
 
 from dhl_sdk.authentication import APIKeyAuthentication
@@ -11,6 +13,7 @@ from dhl_sdk.db_entities import (
     Experiment,
     File,
     FlowVariableReference,
+    Instances,
     Product,
     Variable,
     VariableCategorical,
@@ -26,20 +29,22 @@ class TestProductEntity(unittest.TestCase):
     def setUp(self):
         self.client = Mock()
         self.client.get.return_value = Mock(
-            json=lambda: [
-                {
-                    "id": "id-123",
-                    "code": "code1",
-                    "name": "product 1",
-                    "description": "description 1",
-                },
-                {
-                    "id": "id-456",
-                    "code": "code2",
-                    "name": "product 2",
-                    "description": "description 2",
-                },
-            ],
+            content=json.dumps(
+                [
+                    {
+                        "id": "id-123",
+                        "code": "code1",
+                        "name": "product 1",
+                        "description": "description 1",
+                    },
+                    {
+                        "id": "id-456",
+                        "code": "code2",
+                        "name": "product 2",
+                        "description": "description 2",
+                    },
+                ]
+            ).encode(),
             headers={"x-total-count": "2"},
         )
 
@@ -125,7 +130,6 @@ class TestProductRequests(unittest.TestCase):
 
         mock_get.assert_called_once_with(
             "https://test.com/api/db/v2/products/id-123",
-            headers={"Authorization": "ApiKey test_auth_key"},
         )
 
     @patch("requests.Session.get")
@@ -142,12 +146,10 @@ class TestProductRequests(unittest.TestCase):
 
         mock_get.assert_any_call(
             ("https://test.com/api/db/v2/products?filterBy[name]=name&archived=any"),
-            headers={"Authorization": "ApiKey test_auth_key"},
         )
 
         mock_get.assert_any_call(
             ("https://test.com/api/db/v2/products?filterBy[code]=code&archived=any"),
-            headers={"Authorization": "ApiKey test_auth_key"},
         )
 
     @patch("requests.Session.get")
@@ -163,14 +165,16 @@ class TestProductRequests(unittest.TestCase):
             Mock(headers={"x-total-count": "0"}),
         ]
 
+        mock_post.return_value.content = b"{}"
+
         with patch.object(product._validator, "is_imported", return_value=False):
             with self.assertRaises(ValidationError):
                 _ = client.create(product)
 
         mock_post.assert_called_once_with(
             "https://test.com/api/db/v2/products",
-            headers={"Authorization": "ApiKey test_auth_key"},
-            json={"code": "code", "name": "name", "description": "description"},
+            headers={"Content-Type": "application/json"},
+            data=b'{"code":"code","name":"name","description":"description"}',
         )
 
 
@@ -185,13 +189,15 @@ class TestVariableEntity(unittest.TestCase):
     def test_variable_spectrum(self):
         client = Mock()
         client.get.return_value = Mock(
-            json=lambda: {
-                "id": "var-id-123",
-                "name": "Variable 1",
-                "code": "var1",
-                "variant": "spectrum",
-                "spectrum": {"xAxis": {"dimension": 10}},
-            }
+            content=json.dumps(
+                {
+                    "id": "var-id-123",
+                    "name": "Variable 1",
+                    "code": "var1",
+                    "variant": "spectrum",
+                    "spectrum": {"xAxis": {"dimension": 10}},
+                }
+            ).encode()
         )
 
         request = Variable.requests(client)
@@ -205,12 +211,14 @@ class TestVariableEntity(unittest.TestCase):
     def test_variable_numeric(self):
         client = Mock()
         client.get.return_value = Mock(
-            json=lambda: {
-                "id": "var-id-123",
-                "name": "Variable 1",
-                "code": "var1",
-                "variant": "numeric",
-            }
+            content=json.dumps(
+                {
+                    "id": "var-id-123",
+                    "name": "Variable 1",
+                    "code": "var1",
+                    "variant": "numeric",
+                }
+            ).encode()
         )
 
         request = Variable.requests(client)
@@ -331,6 +339,46 @@ class TestVariableEntity(unittest.TestCase):
             },
         )
 
+    def test_variable_flows_validation(self):
+        var = Variable.new(
+            code="FEED1",
+            name="Feed 1",
+            description="description",
+            variable_group="Feeds/Flows",
+            variable_type=VariableFlow(
+                type="conti",
+                stepSize=1000,
+                volumeId="vol-id",
+                references=[
+                    FlowVariableReference(
+                        measurementId="meas-id-111", concentrationId="conc-id-222"
+                    ),
+                    FlowVariableReference(
+                        measurementId="meas-id-111", concentrationId="conc-id-333"
+                    ),
+                ],
+            ),
+            measurement_unit="n",
+        )
+        var.group.validate_group(self.variable_group_codes)
+
+        def get(path, query_params=None):
+            if query_params is not None:
+                return Mock(headers={"x-total-count": "0"})
+            code = "X" if "meas" in path else "FeedConc"
+            return Mock(status_code=200, content=json.dumps({"group": {"code": code}}))
+
+        client = Mock()
+        client.get.side_effect = get
+
+        self.assertTrue(var._validator.validate(var, client))
+
+        # the shared measurement variable is requested once
+        self.assertEqual(
+            [c for c in client.get.call_args_list if "meas-id-111" in c.args[0]],
+            [call("api/db/v2/variables/meas-id-111")],
+        )
+
     def test_variable_request_flows(self):
         var = Variable.new(
             code="FEED1",
@@ -400,7 +448,6 @@ class TestVariableRequests(unittest.TestCase):
 
         mock_get.assert_called_once_with(
             "https://test.com/api/db/v2/variables/id-123",
-            headers={"Authorization": "ApiKey test_auth_key"},
         )
 
     @patch("requests.Session.get")
@@ -415,13 +462,15 @@ class TestVariableRequests(unittest.TestCase):
         )
 
         mock_group_json = Mock()
-        mock_group_json.json.return_value = [
-            {
-                "name": "X Variables",
-                "id": "959606c1-44bc-4657-82ff-70c247be14aa",
-                "code": "X",
-            }
-        ]
+        mock_group_json.content = json.dumps(
+            [
+                {
+                    "name": "X Variables",
+                    "id": "959606c1-44bc-4657-82ff-70c247be14aa",
+                    "code": "X",
+                }
+            ]
+        ).encode()
 
         mock_get.side_effect = [
             mock_group_json,
@@ -437,7 +486,6 @@ class TestVariableRequests(unittest.TestCase):
                 [
                     call(
                         "https://test.com/api/db/v2/groups",
-                        headers={"Authorization": "ApiKey test_auth_key"},
                     ),
                     call(
                         (
@@ -445,7 +493,6 @@ class TestVariableRequests(unittest.TestCase):
                             "filterBy[code]=var1&filterBy[group._id]="
                             "959606c1-44bc-4657-82ff-70c247be14aa&archived=any"
                         ),
-                        headers={"Authorization": "ApiKey test_auth_key"},
                     ),
                     call(
                         (
@@ -453,7 +500,6 @@ class TestVariableRequests(unittest.TestCase):
                             "filterBy[name]=Variable+1&filterBy[group._id]="
                             "959606c1-44bc-4657-82ff-70c247be14aa&archived=any"
                         ),
-                        headers={"Authorization": "ApiKey test_auth_key"},
                     ),
                 ]
             )
@@ -564,33 +610,94 @@ class TestFileRequests(unittest.TestCase):
             validator=ExperimentFileValidator(),
         )
 
-        mock_post.return_value.json.return_value = {"id": "file-id-123"}
+        mock_post.return_value.content = b'{"id": "file-id-123"}'
 
         file_id = file.create_file(self.client._client)
 
         mock_post.assert_called_once_with(
             "https://test.com/api/db/v2/files",
-            headers={"Authorization": "ApiKey test_auth_key"},
-            json={
-                "name": "file1",
-                "description": "description1",
-                "type": "runData",
-            },
+            headers={"Content-Type": "application/json"},
+            data=b'{"name":"file1","description":"description1","type":"runData"}',
         )
 
         mock_put.assert_called_once_with(
             "https://test.com/api/db/v2/files/file-id-123/data",
-            headers={"Authorization": "ApiKey test_auth_key"},
-            json={
-                "timeseries": {
-                    "var1": {"timestamps": [1, 2, 3], "values": [10, 20, 30]},
-                    "var2": {"timestamps": [7, 8, 9], "values": [70, 80, 90]},
-                }
-            },
+            headers={"Content-Type": "application/json"},
+            data=(
+                b'{"timeseries":{'
+                b'"var1":{"timestamps":[1,2,3],"values":[10,20,30]},'
+                b'"var2":{"timestamps":[7,8,9],"values":[70,80,90]}}}'
+            ),
         )
 
         self.assertEqual(file_id, "file-id-123")
 
+    def test_spectra_files_create_success(self):
+        file = File(
+            name="file1",
+            description="description1",
+            type="spectra",
+            data={
+                "spectra": {"timestamps": [1, 2], "values": [[0.1, 0.2], [0.3, 0.4]]},
+                "var1": {"timestamps": [1, 2], "values": [10, 20]},
+            },
+            validator=ExperimentFileValidator(),
+        )
+
+        client = Mock()
+        # the files are uploaded concurrently, answer according to the file type
+        client.post.side_effect = lambda url, body: Mock(
+            content=json.dumps({"id": f"{body['type']}-id"})
+        )
+
+        file_id = file.create_file(client)
+
+        self.assertEqual(file_id, ("runSpectra-id", "runData-id"))
+        client.put.assert_has_calls(
+            [
+                call(
+                    "api/db/v2/files/runSpectra-id/data",
+                    data="1,0.1,0.2\r\n2,0.3,0.4\r\n",
+                    content_type="text/csv",
+                ),
+                call(
+                    "api/db/v2/files/runData-id/data",
+                    data={
+                        "timeseries": {
+                            "var1": {"timestamps": [1, 2], "values": [10, 20]}
+                        }
+                    },
+                    content_type="application/json",
+                ),
+            ],
+            any_order=True,
+        )
+
+    def test_spectra_files_create_partial_failure(self):
+        file = File(
+            name="file1",
+            description="description1",
+            type="spectra",
+            data={
+                "spectra": {"timestamps": [1, 2], "values": [[0.1, 0.2], [0.3, 0.4]]},
+                "var1": {"timestamps": [1, 2], "values": [10, 20]},
+            },
+            validator=ExperimentFileValidator(),
+        )
+
+        def post(url, body):
+            if body["type"] == "runSpectra":
+                raise requests.HTTPError("500 Server Error")
+            return Mock(content=json.dumps({"id": f"{body['type']}-id"}))
+
+        client = Mock()
+        client.post.side_effect = post
+
+        # the targets file created meanwhile is reported
+        with self.assertRaisesRegex(ImportValidationException, "runData-id") as ctx:
+            file.create_file(client)
+        self.assertIsInstance(ctx.exception.__cause__, requests.HTTPError)
+
 
 class TestExperimentsEntity(unittest.TestCase):
     def setUp(self):
@@ -651,3 +758,30 @@ class TestExperimentsEntity(unittest.TestCase):
                 },
             },
         )
+
+    def test_experiment_get_data(self):
+        self.experiment.instances = [
+            Instances(column="var1", fileId="file-1"),
+            Instances(column="var2", fileId="file-2"),
+        ]
+        timeseries = {
+            "var1": {"timestamps": [1, 2, 3], "values": [10, 20, 30]},
+            "var2": {"timestamps": [7, 8, 9], "values": [70, 80, 90]},
+        }
+
+        def get(path):
+            column = "var1" if "file-1" in path else "var2"
+            return Mock(
+                headers={"content-type": "application/json"},
+                content=json.dumps({"timeseries": {column: timeseries[column]}}),
+            )
+
+        client = Mock()
+        client._client.get.side_effect = get
+
+        self.assertEqual(self.experiment.get_data(client), timeseries)
+        client._client.get.assert_has_calls(
+            [call("api/db/v2/files/file-1/data"), call("api/db/v2/files/file-2/data")],
+            any_order=True,
+        )
+        self.assertEqual(client._client.get.call_count, 2)
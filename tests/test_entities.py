@@ -1,4 +1,6 @@
 # pylint: disable=missing-docstring
+import json
+import time
 import unittest
 from unittest.mock import Mock, patch
 
@@ -13,26 +15,31 @@ from dhl_sdk.entities import (
     SpectraModel,
     Variable,
 )
+from dhl_sdk.exceptions import PredictionRequestException
+
+EMPTY_PAGE = Mock(content=b"[]", headers={"x-total-count": "0"})
 
 
 class TestProjectEntity(unittest.TestCase):
     def setUp(self):
         self.client = Mock()
         self.client.get.return_value = Mock(
-            json=lambda: [
-                {
-                    "id": "id-123",
-                    "name": "project 1",
-                    "description": "description 1",
-                    "processUnitId": "373c173a-1f23-4e56-874e-90ca4702ec0d",
-                },
-                {
-                    "id": "id-456",
-                    "name": "project 2",
-                    "description": "description 2",
-                    "processUnitId": "373c173a-1f23-4e56-874e-90ca4702ec0d",
-                },
-            ],
+            content=json.dumps(
+                [
+                    {
+                        "id": "id-123",
+                        "name": "project 1",
+                        "description": "description 1",
+                        "processUnitId": "373c173a-1f23-4e56-874e-90ca4702ec0d",
+                    },
+                    {
+                        "id": "id-456",
+                        "name": "project 2",
+                        "description": "description 2",
+                        "processUnitId": "373c173a-1f23-4e56-874e-90ca4702ec0d",
+                    },
+                ]
+            ).encode(),
             headers={"x-total-count": "2"},
         )
 
@@ -88,13 +95,89 @@ class TestProjectEntity(unittest.TestCase):
             model_factory.get_model()
 
 
+class TestModel(unittest.TestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.client.get.side_effect = lambda path: Mock(
+            content=json.dumps(
+                {
+                    "id": path.rsplit("/", 1)[-1],
+                    "name": "variable",
+                    "code": path.rsplit("/", 1)[-1],
+                    "variant": "numeric",
+                }
+            ).encode()
+        )
+        self.model = CultivationPropagationModel(
+            id="model-id",
+            name="model",
+            status="success",
+            projectId="project-id",
+            dataset={
+                "id": "dataset-id",
+                "name": "dataset",
+                "description": "",
+                "variables": [{"id": "var-1"}, {"id": "var-2"}, {"id": "var-3"}],
+            },
+            config={"groups": {"X": ["var-1"], "Z": ["var-3"]}},
+            client=self.client,
+        )
+
+    def test_model_variables_cached(self):
+        requests_count = self.client.get.call_count
+
+        variables = self.model.model_variables
+        self.assertEqual([variable.id for variable in variables], ["var-1", "var-3"])
+
+        self.assertIs(self.model.model_variables, variables)
+        self.assertEqual(self.client.get.call_count, requests_count)
+
+    @patch("dhl_sdk.entities.format_predictions")
+    def test_get_predictions_batches(self, mock_format):
+        mock_format.side_effect = lambda predictions, model: predictions
+        preprocessor = Mock()
+        preprocessor.validate.return_value = True
+        preprocessor.format.return_value = [{"batch": i} for i in range(6)]
+
+        def post(url, data):
+            # the first batches are answered last
+            time.sleep(0.01 * (6 - data["batch"]))
+            return Mock(
+                content=json.dumps({"instances": [[{"values": [data["batch"]]}]]})
+            )
+
+        self.client.post.side_effect = post
+
+        predictions = self.model.get_predictions(preprocessor)
+        self.assertEqual(
+            [prediction.instances[0][0].values for prediction in predictions],
+            [[0], [1], [2], [3], [4], [5]],
+        )
+        self.assertEqual(self.client.post.call_count, 6)
+
+    def test_get_predictions_batch_error(self):
+        preprocessor = Mock()
+        preprocessor.validate.return_value = True
+        preprocessor.format.return_value = [{"batch": i} for i in range(6)]
+
+        def post(url, data):
+            if data["batch"] == 3:
+                return Mock(content=b'{"error": "invalid batch"}')
+            return Mock(content=b'{"instances": [[{"values": [1]}]]}')
+
+        self.client.post.side_effect = post
+
+        with self.assertRaisesRegex(PredictionRequestException, "invalid batch"):
+            self.model.get_predictions(preprocessor)
+
+
 class TestEntitiesRequests(unittest.TestCase):
     def setUp(self):
         self.auth_key = APIKeyAuthentication("test_auth_key")
         self.base_url = "https://test.com"
         self.client = Client(self.auth_key, self.base_url)
 
-    @patch("requests.Session.get")
+    @patch("requests.Session.get", return_value=Mock(content=b"{}"))
     def test_get_variables(self, mock_get):
         request = Variable.requests(self.client)
 
@@ -103,10 +186,9 @@ class TestEntitiesRequests(unittest.TestCase):
 
         mock_get.assert_called_once_with(
             "https://test.com/api/db/v2/variables/var-id-123",
-            headers={"Authorization": "ApiKey test_auth_key"},
         )
 
-    @patch("requests.Session.get")
+    @patch("requests.Session.get", return_value=EMPTY_PAGE)
     def test_get_projects_result(self, mock_get):
         project_requests = CultivationProject.requests(self.client)
         result = Result[CultivationProject](5, {}, project_requests)
@@ -116,10 +198,9 @@ class TestEntitiesRequests(unittest.TestCase):
         mock_get.assert_called_once_with(
             "https://test.com/api/db/v2/projects?offset=0"
             "&limit=5&archived=false&sortBy[createdAt]=desc",
-            headers={"Authorization": "ApiKey test_auth_key"},
         )
 
-    @patch("requests.Session.get")
+    @patch("requests.Session.get", return_value=EMPTY_PAGE)
     def test_get_spectramodels_result(self, mock_get):
         model_requests = SpectraModel.requests(self.client)
         result = Result[SpectraModel](5, {}, model_requests)
@@ -130,10 +211,9 @@ class TestEntitiesRequests(unittest.TestCase):
         mock_get.assert_called_once_with(
             "https://test.com/api/db/v2/pipelineJobs?offset=0"
             "&limit=5&archived=false&sortBy[createdAt]=desc",
-            headers={"Authorization": "ApiKey test_auth_key"},
         )
 
-    @patch("requests.Session.get")
+    @patch("requests.Session.get", return_value=EMPTY_PAGE)
     def test_get_cultivationmodels_result(self, mock_get):
         model_requests = CultivationPropagationModel.requests(self.client)
         result = Result[CultivationPropagationModel](5, {}, model_requests)
@@ -144,5 +224,4 @@ class TestEntitiesRequests(unittest.TestCase):
         mock_get.assert_called_once_with(
             "https://test.com/api/db/v2/pipelineJobs?offset=0"
             "&limit=5&archived=false&sortBy[createdAt]=desc",
-            headers={"Authorization": "ApiKey test_auth_key"},
         )
@@ -1,19 +1,29 @@
 # pylint: disable=missing-docstring
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import numpy as np
+import requests
 from pydantic import BaseModel
 
 from dhl_sdk._input_processing import (
     CultivationHistoricalPreprocessor,
     CultivationPropagationPreprocessor,
     SpectraPreprocessor,
+    _convert_to_request,
     _validate_spectra_format,
     format_predictions,
 )
-from dhl_sdk._utils import Instance, PredictResponse
-from dhl_sdk.crud import Result
+from dhl_sdk._utils import (
+    Instance,
+    PredictRequest,
+    PredictResponse,
+    VariableGroupCodes,
+    urljoin,
+)
+from dhl_sdk.authentication import APIKeyAuthentication
+from dhl_sdk.client import Client
+from dhl_sdk.crud import CRUDClient, EntityCache, Result, decode_json
 from dhl_sdk.entities import Variable
 from dhl_sdk.exceptions import (
     InvalidInputsException,
@@ -50,9 +60,15 @@ class TestSpectraUtils(unittest.TestCase):
         spectra2 = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], dtype=np.float32)
         spectra3 = "spectra"
 
-        self.assertEqual(_validate_spectra_format(spectra1), spectra1)
-        self.assertEqual(_validate_spectra_format(spectra2), spectra1)
+        spectra4 = [[1.0, 2.0, 3.0], [4.0, 5.0]]
+        spectra5 = [[1.0, None, 3.0], [4.0, 5.0, 6.0]]
+
+        np.testing.assert_array_equal(_validate_spectra_format(spectra1), spectra1)
+        np.testing.assert_array_equal(_validate_spectra_format(spectra2), spectra1)
+        self.assertEqual(_validate_spectra_format(spectra2).dtype, np.float64)
         self.assertRaises(InvalidSpectraException, _validate_spectra_format, spectra3)
+        self.assertRaises(InvalidSpectraException, _validate_spectra_format, spectra4)
+        self.assertRaises(InvalidSpectraException, _validate_spectra_format, spectra5)
 
     def test_format_predictions(self):
         predictions = [
@@ -185,6 +201,13 @@ class TestSpectraUtils(unittest.TestCase):
                 )
             )
 
+        processor = SpectraPreprocessor(spectra=spectra, model=model, inputs=inputs)
+        processor.validate()
+        with self.assertRaisesRegex(
+            InvalidInputsException, "select one of the following as inputs: var1, var2$"
+        ):
+            processor.format()
+
         inputs = {"var1": [0, 1, 0], "var2": [1, 1, 1]}
         processor = SpectraPreprocessor(spectra=spectra, model=model, inputs=inputs)
 
@@ -228,6 +251,34 @@ class TestSpectraUtils(unittest.TestCase):
         self.assertEqual(request[0]["instances"][0][0]["values"][2], [7, 8, 9, 9])
         self.assertEqual(request[0]["instances"][0][2]["values"], [1, 1, 1])
 
+        # the requests are built by hand in the schema of PredictRequest
+        for json_data in request:
+            self.assertEqual(
+                PredictRequest.model_validate(json_data).model_dump(by_alias=True),
+                json_data,
+            )
+
+    def test_convert_request_batch_size(self):
+        model = self.model_no_inputs
+        model.dataset.get_spectrum_index.return_value = 0
+        spectra = np.ones((10, 4))
+
+        request = _convert_to_request(spectra, model=model, batch_size=4)
+        self.assertEqual(
+            [len(r["instances"][0][0]["values"]) for r in request], [4, 4, 2]
+        )
+
+        # each spectrum is about 80 bytes in JSON, so only 2 fit in 200 bytes
+        request = _convert_to_request(spectra, model=model, target_bytes=200)
+        self.assertEqual(len(request), 5)
+        self.assertEqual(request[-1]["instances"][0][0]["sampleId"], ["0", "1"])
+
+        # without target_bytes only batch_size limits the batches of wide spectra
+        request = _convert_to_request(np.ones((60, 1000)), model=model)
+        self.assertEqual(
+            [len(r["instances"][0][0]["values"]) for r in request], [50, 10]
+        )
+
     def test_convert_request_noinput(self):
         model = self.model_no_inputs
         model.spectra_size = 4
@@ -728,3 +779,182 @@ class TestResults(unittest.TestCase):
 
         # tests the StopIteration exception
         self.assertRaises(StopIteration, next, results)
+
+    def test_results_prefetch(self):
+        requests = Mock()
+        requests.list.side_effect = [(["a", "b"], 3), (["c"], 3), ([], 3)]
+        results = Result[str](limit=2, query_params={}, requests=requests)
+
+        self.assertEqual(next(results), "a")
+
+        # the second page is requested while the first one is consumed
+        results._prefetch.pages[0].result()
+        requests.list.assert_called_with(2, 2, {})
+
+        self.assertEqual(list(results), ["b", "c"])
+
+    def test_results_prefetch_window(self):
+        requests = Mock()
+        requests.list.side_effect = lambda offset, limit, query_params: (
+            list(range(offset, min(offset + limit, 10))),
+            10,
+        )
+        results = Result[int](limit=2, query_params={}, requests=requests)
+
+        self.assertEqual(next(results), 0)
+        self.assertEqual(len(results._prefetch.pages), 1)
+
+        # more pages are requested ahead as the results are consumed
+        self.assertEqual([next(results) for _ in range(2)], [1, 2])
+        self.assertEqual(len(results._prefetch.pages), 2)
+
+        self.assertEqual(list(results), list(range(3, 10)))
+        self.assertEqual(requests.list.call_count, 5)
+
+    def test_results_len(self):
+        requests = Mock()
+        requests.list.side_effect = [([], 2), (["a", "b"], 2)]
+        results = Result[str](limit=2, query_params={}, requests=requests)
+
+        # only the count is requested before a page is loaded
+        self.assertEqual(len(results), 2)
+        requests.list.assert_called_once_with(0, 0, {})
+
+        self.assertEqual(list(results), ["a", "b"])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(requests.list.call_count, 2)
+
+    def test_results_len_after_first_page(self):
+        requests = Mock()
+        requests.list.side_effect = [(["a", "b"], 3), (["c"], 3)]
+        results = Result[str](limit=2, query_params={}, requests=requests)
+
+        self.assertEqual(next(results), "a")
+        self.assertEqual(len(results), 3)
+        self.assertEqual(list(results), ["b", "c"])
+        self.assertEqual(requests.list.call_count, 2)
+
+    def test_results_pages(self):
+        requests = Mock()
+        requests.list.side_effect = [(["a", "b"], 3), (["c"], 3), ([], 3)]
+        results = Result[str](limit=2, query_params={}, requests=requests)
+
+        self.assertEqual(next(results), "a")
+        self.assertEqual(list(results.pages()), [["b"], ["c"]])
+
+
+class TestDecodeJson(unittest.TestCase):
+    def test_decode_json(self):
+        response = requests.Response()
+        response._content = b'[{"id": "var-id", "values": [1.5, 2]}]'
+        self.assertEqual(decode_json(response), [{"id": "var-id", "values": [1.5, 2]}])
+
+        response._content = b"<html>Bad Gateway</html>"
+        with self.assertRaises(requests.JSONDecodeError):
+            decode_json(response)
+
+
+class TestCRUDClientCache(unittest.TestCase):
+    def setUp(self):
+        self.client = Mock(entity_cache=EntityCache())
+        self.client.get.return_value.content = b'{"id": "var-id", "name": "var"}'
+        self.requests = CRUDClient[dict](
+            self.client, "api/db/v2/variables", dict, cached=True
+        )
+
+    def test_get_cached(self):
+        first = self.requests.get("var-id")
+        second = self.requests.get("var-id")
+        self.client.get.assert_called_once_with("api/db/v2/variables/var-id")
+
+        # each call builds its own entity from the cached response
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+        self.requests.get("other-id")
+        self.assertEqual(self.client.get.call_count, 2)
+
+    @patch("dhl_sdk.crud.time.monotonic")
+    def test_get_cache_expire(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        self.requests.get("var-id")
+
+        mock_monotonic.return_value = 61
+        self.requests.get("var-id")
+        self.assertEqual(self.client.get.call_count, 2)
+
+
+class TestUrlJoin(unittest.TestCase):
+    def test_urljoin(self):
+        self.assertEqual(
+            urljoin("https://test.com", "api/db/v2/products"),
+            "https://test.com/api/db/v2/products",
+        )
+        self.assertEqual(
+            urljoin("https://test.com/dhl/", "api/db/v2/files", "id-1/data"),
+            "https://test.com/dhl/api/db/v2/files/id-1/data",
+        )
+        # not plain relative paths are resolved as by urllib
+        self.assertEqual(
+            urljoin("https://test.com/dhl", "/api/db"), "https://test.com/api/db"
+        )
+        self.assertEqual(
+            urljoin("https://test.com/dhl/v1", "../api"), "https://test.com/dhl/api"
+        )
+
+
+class TestVariableGroupCodes(unittest.TestCase):
+    def setUp(self):
+        VariableGroupCodes.clear()
+        self.client = Mock()
+        self.client.get.return_value.content = (
+            b'[{"name": "X Variables", "id": "x-id", "code": "X"}]'
+        )
+
+    def tearDown(self):
+        VariableGroupCodes.clear()
+
+    def test_group_codes_cached(self):
+        codes = VariableGroupCodes(self.client).get_variable_group_codes()
+        self.assertEqual(codes, {"X Variables": ("x-id", "X")})
+
+        # the groups are requested once per client session
+        VariableGroupCodes(self.client)
+        self.client.get.assert_called_once_with("api/db/v2/groups")
+
+        other_client = Mock()
+        other_client.get.return_value.content = b"[]"
+        self.assertEqual(
+            VariableGroupCodes(other_client).get_variable_group_codes(), {}
+        )
+
+    @patch("requests.Session.get")
+    def test_group_codes_shared_by_clients(self, mock_get):
+        mock_get.return_value.content = b"[]"
+        auth_key = APIKeyAuthentication("test_auth_key")
+
+        VariableGroupCodes(Client(auth_key, "https://test.com"))
+        VariableGroupCodes(
+            Client(APIKeyAuthentication("test_auth_key"), "https://test.com")
+        )
+        mock_get.assert_called_once_with("https://test.com/api/db/v2/groups")
+
+        # other users or applications may see other groups
+        VariableGroupCodes(
+            Client(APIKeyAuthentication("other_key"), "https://test.com")
+        )
+        VariableGroupCodes(Client(auth_key, "https://other.test.com"))
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("dhl_sdk._utils.time.monotonic")
+    def test_group_codes_expire(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        VariableGroupCodes(self.client)
+        VariableGroupCodes(Mock(**{"get.return_value.content": b"[]"}))
+
+        mock_monotonic.return_value = 301
+        VariableGroupCodes(self.client)
+        self.assertEqual(self.client.get.call_count, 2)
+
+        # the expired groups of the other client are dropped
+        self.assertEqual(len(VariableGroupCodes._instances), 1)